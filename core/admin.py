@@ -1,15 +1,30 @@
+from collections import defaultdict
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.forms.models import BaseInlineFormSet
 from django_tenants.admin import TenantAdminMixin
 from django.contrib import messages
 from django.db import transaction
+from django.db.models import (
+    BooleanField, Case, Prefetch, Value, When, prefetch_related_objects,
+)
+from django.db.models.functions import Now
 from django.utils import timezone
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.urls import reverse
 from django.shortcuts import get_object_or_404
 from guardian.admin import GuardedModelAdmin
-from guardian.shortcuts import assign_perm, remove_perm, get_users_with_perms
+from guardian.models import UserObjectPermission
+from guardian.shortcuts import get_users_with_perms
 from simple_history.admin import SimpleHistoryAdmin
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
+from .permissions import (
+    BULK_BATCH_SIZE, assign_object_perms, build_object_perms, bulk_assign_perms,
+    remove_object_perms, users_with_perm_count, users_with_perm_filter,
+)
 from .models import (
     Site, Domain, Organization, OrganizationMember, 
     OrganizationSite, OrganizationInvitation
@@ -22,6 +37,43 @@ except ImportError:
     pass
 
 
+# Static status snippets rendered on every changelist row
+_ACCEPTED_HTML = mark_safe('<span style="color: green;">✓ Accepted</span>')
+_EXPIRED_HTML = mark_safe('<span style="color: red;">✗ Expired</span>')
+_PENDING_HTML = mark_safe('<span style="color: orange;">⏳ Pending</span>')
+_NO_PRIMARY_DOMAIN_HTML = mark_safe('<span style="color: orange;">⚠ No primary domain set</span>')
+
+
+class SiteAccessFilter(admin.SimpleListFilter):
+    """Filter sites by whether any user has been granted access"""
+    title = 'user access'
+    parameter_name = 'has_users'
+    
+    def lookups(self, request, model_admin):
+        return (
+            ('yes', 'Has users'),
+            ('no', 'No users'),
+        )
+    
+    def queryset(self, request, queryset):
+        # EXISTS stops at the first matching row instead of counting them all
+        if self.value() == 'yes':
+            return queryset.filter(users_with_perm_filter(Site, 'access_site', 'pk'))
+        if self.value() == 'no':
+            return queryset.filter(~users_with_perm_filter(Site, 'access_site', 'pk'))
+        return queryset
+
+
+class DeferredFieldsChangeList(ChangeList):
+    """ChangeList that skips loading columns the list page never renders"""
+    
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.changelist_defer:
+            qs = qs.defer(*self.model_admin.changelist_defer)
+        return qs
+
+
 class BaseModelAdmin(admin.ModelAdmin):
     """
     Mixin for admin classes that handle BaseModel subclasses.
@@ -30,6 +82,11 @@ class BaseModelAdmin(admin.ModelAdmin):
     and provides common readonly fields and optimization.
     """
     readonly_fields = ('created_at', 'updated_at', 'created_by', 'modified_by')
+    # Large fields left out of the changelist SELECT (change form loads everything)
+    changelist_defer = ()
+    
+    def get_changelist(self, request, **kwargs):
+        return DeferredFieldsChangeList
     
     def get_queryset(self, request):
         """Optimize queries by selecting related user fields"""
@@ -74,7 +131,7 @@ class DomainInline(admin.TabularInline):
 @admin.register(Site)
 class SiteAdmin(GuardedModelAdmin, TenantAdminMixin, SimpleHistoryAdmin):
     list_display = ('name', 'schema_name', 'primary_domain', 'created_on', 'is_active', 'user_count')
-    list_filter = ('created_on', 'is_active')
+    list_filter = ('created_on', 'is_active', SiteAccessFilter)
     search_fields = ('name', 'schema_name', 'domains__domain')
     readonly_fields = ('created_on', 'user_count', 'primary_domain')
     inlines = [DomainInline]
@@ -103,50 +160,50 @@ class SiteAdmin(GuardedModelAdmin, TenantAdminMixin, SimpleHistoryAdmin):
     
     def get_queryset(self, request):
         """Optimize queries"""
-        return super().get_queryset(request).prefetch_related('organization_sites', 'domains')
+        return super().get_queryset(request).prefetch_related(
+            'organization_sites', 'domains'
+        ).annotate(_user_count=users_with_perm_count(Site, 'access_site', 'pk'))
     
     def primary_domain(self, obj):
         """Display the primary domain for this site"""
-        try:
-            primary = obj.domains.filter(is_primary=True).first()
-            if primary:
-                return format_html('<a href="{}" target="_blank">{}</a>', 
-                    f"http://{primary.domain}:8000",
-                    primary.domain
-                )
-            return format_html('<span style="color: orange;">⚠ No primary domain set</span>')
-        except:
-            return "Unknown"
+        # Scan the prefetched domains instead of issuing a filtered query per row
+        primary = next((d for d in obj.domains.all() if d.is_primary), None)
+        if primary:
+            return format_html('<a href="{}" target="_blank">{}</a>', 
+                f"http://{primary.domain}:8000",
+                primary.domain
+            )
+        return _NO_PRIMARY_DOMAIN_HTML
     primary_domain.short_description = 'Primary Domain'
     
     def user_count(self, obj):
         """Display count of users with access to this site"""
-        from guardian.shortcuts import get_users_with_perms
+        if hasattr(obj, '_user_count'):
+            return obj._user_count
         users = get_users_with_perms(obj, only_with_perms_in=['access_site'])
         return users.count()
     user_count.short_description = 'Users with Access'
+    user_count.admin_order_field = '_user_count'
     
     def save_model(self, request, obj, form, change):
-        """Save the site and handle schema creation"""
-        # Let django-tenants handle schema creation with auto_create_schema=True
+        """Save the site and hand schema creation to a worker"""
+        if change:
+            super().save_model(request, obj, form, change)
+            return
+        
+        # Creating the schema runs every tenant migration; keep it out of the
+        # admin request and let the worker create it once the row is committed
+        obj.auto_create_schema = False
         super().save_model(request, obj, form, change)
         
-        if not change:  # Only for new sites
-            # Run migrations for the newly created schema
-            try:
-                from django.core.management import call_command
-                call_command('migrate_schemas', schema_name=obj.schema_name, verbosity=0)
-                
-                messages.success(
-                    request,
-                    f'Site "{obj.name}" created successfully with schema "{obj.schema_name}" and migrations applied!'
-                )
-            except Exception as e:
-                messages.warning(
-                    request,
-                    f'Site "{obj.name}" created with schema "{obj.schema_name}" but migration failed: {e}. '
-                    f'Please run: python manage.py migrate_schemas --schema={obj.schema_name}'
-                )
+        from .tasks import migrate_tenant_schema
+        schema_name = obj.schema_name
+        transaction.on_commit(lambda: migrate_tenant_schema.delay(schema_name), robust=True)
+        
+        messages.success(
+            request,
+            f'Site "{obj.name}" created successfully. Schema "{obj.schema_name}" is being created in the background.'
+        )
 
 
 # Domain Admin (unregistered - managed via Site inline)
@@ -169,9 +226,23 @@ class DomainAdmin(SimpleHistoryAdmin):
 
 # Organization Admin Classes
 
+# Number of related rows rendered as forms in the organization inlines
+INLINE_PAGE_SIZE = 25
+
+
+class LimitedInlineFormSet(BaseInlineFormSet):
+    """Inline formset that only builds forms for the first INLINE_PAGE_SIZE rows"""
+    
+    def get_queryset(self):
+        if not hasattr(self, '_limited_queryset'):
+            self._limited_queryset = list(super().get_queryset()[:INLINE_PAGE_SIZE])
+        return self._limited_queryset
+
+
 class OrganizationMemberInline(admin.TabularInline):
     """Inline for Organization Members"""
     model = OrganizationMember
+    formset = LimitedInlineFormSet
     fields = ('user', 'role', 'title', 'department', 'is_active', 'joined_at')
     readonly_fields = ('joined_at',)
     extra = 0
@@ -183,6 +254,7 @@ class OrganizationMemberInline(admin.TabularInline):
 class OrganizationSiteInline(admin.TabularInline):
     """Inline for Organization Sites"""
     model = OrganizationSite
+    formset = LimitedInlineFormSet
     fields = ('site', 'is_primary', 'site_role', 'is_active', 'created_at')
     readonly_fields = ('created_at',)
     extra = 0
@@ -191,9 +263,19 @@ class OrganizationSiteInline(admin.TabularInline):
         return super().get_queryset(request).select_related('site')
 
 
+class PendingInvitationFormSet(BaseInlineFormSet):
+    """Inline formset that reuses invitations prefetched by OrganizationAdmin.get_object"""
+    
+    def get_queryset(self):
+        if hasattr(self.instance, '_pending_invitations'):
+            return self.instance._pending_invitations
+        return super().get_queryset()
+
+
 class OrganizationInvitationInline(admin.TabularInline):
     """Inline for Organization Invitations"""
     model = OrganizationInvitation
+    formset = PendingInvitationFormSet
     fields = ('email', 'role', 'is_accepted', 'expires_at', 'invited_by')
     readonly_fields = ('invited_by',)
     extra = 0
@@ -217,8 +299,11 @@ class OrganizationAdmin(GuardedModelAdmin, BaseModelAdmin, SimpleHistoryAdmin):
         'created_at', 'verified_at'
     )
     search_fields = ('name', 'slug', 'email', 'website')
+    list_select_related = ('created_by', 'modified_by')
+    changelist_defer = ('description', 'address', 'settings')
     readonly_fields = (
         'slug', 'verified_at', 'member_count', 'owner_count', 'site_count',
+        'all_members_link', 'all_sites_link',
         'created_at', 'updated_at', 'created_by', 'modified_by'
     )
     
@@ -247,7 +332,7 @@ class OrganizationAdmin(GuardedModelAdmin, BaseModelAdmin, SimpleHistoryAdmin):
             'classes': ('collapse',)
         }),
         ('Statistics', {
-            'fields': ('owner_count',),
+            'fields': ('owner_count', 'all_members_link', 'all_sites_link'),
             'classes': ('collapse',)
         }),
         ('Audit Trail', {
@@ -264,6 +349,9 @@ class OrganizationAdmin(GuardedModelAdmin, BaseModelAdmin, SimpleHistoryAdmin):
         """Auto-populate invited_by field for new invitations"""
         instances = formset.save(commit=False)
         
+        for obj in formset.deleted_objects:
+            obj.delete()
+        
         for instance in instances:
             # Auto-populate invited_by for new OrganizationInvitation instances
             if isinstance(instance, OrganizationInvitation):
@@ -272,30 +360,67 @@ class OrganizationAdmin(GuardedModelAdmin, BaseModelAdmin, SimpleHistoryAdmin):
             
             instance.save()
         
+        # Instances are saved above; calling super() would save each one again
         formset.save_m2m()
-        super().save_formset(request, form, formset, change)
     
     def get_queryset(self, request):
-        """Optimize queries"""
+        """Optimize queries by annotating counts in the changelist SELECT"""
         qs = super().get_queryset(request)
-        return qs.prefetch_related(
-            'members', 'organization_sites', 'invitations'
-        ).select_related('created_by', 'modified_by')
+        return qs.with_counts().select_related('created_by', 'modified_by')
+    
+    def get_object(self, request, object_id, from_field=None):
+        """Prefetch inline relations only for the change form"""
+        obj = super().get_object(request, object_id, from_field)
+        if obj is not None:
+            prefetch_related_objects(
+                [obj],
+                Prefetch(
+                    'invitations',
+                    queryset=OrganizationInvitation.objects.filter(
+                        is_accepted=False, expires_at__gt=Now()
+                    ).select_related('invited_by').order_by('pk'),
+                    to_attr='_pending_invitations'
+                ),
+            )
+        return obj
     
     def member_count(self, obj):
         """Display member count"""
         return obj.get_member_count()
     member_count.short_description = 'Members'
+    member_count.admin_order_field = '_member_count'
     
     def owner_count(self, obj):
         """Display owner count"""
         return obj.get_owner_count()
     owner_count.short_description = 'Owners'
+    owner_count.admin_order_field = '_owner_count'
     
     def site_count(self, obj):
         """Display site count"""
         return obj.get_site_count()
     site_count.short_description = 'Sites'
+    site_count.admin_order_field = '_site_count'
+    
+    def all_members_link(self, obj):
+        """Link to the full member list, since the inline shows only the first page"""
+        return format_html(
+            '<a href="{}?organization__id__exact={}">View all {} members</a>',
+            reverse('admin:core_organizationmember_changelist'),
+            obj.pk,
+            self.member_count(obj)
+        )
+    all_members_link.short_description = 'All Members'
+    
+    def all_sites_link(self, obj):
+        """Link to the full site list, since the inline shows only the first page"""
+        return format_html(
+            '<a href="{}?organization__id__exact={}">View all {} sites</a>',
+            reverse('admin:core_organizationsite_changelist'),
+            obj.pk,
+            self.site_count(obj)
+        )
+    all_sites_link.short_description = 'All Sites'
     
     def verify_organizations(self, request, queryset):
         """Bulk action to verify organizations"""
@@ -311,35 +436,56 @@ class OrganizationAdmin(GuardedModelAdmin, BaseModelAdmin, SimpleHistoryAdmin):
         )
     verify_organizations.short_description = "Verify selected organizations"
     
+    @transaction.atomic
     def make_owners_of_organizations(self, request, queryset):
         """Bulk action to make current user owner of selected organizations"""
-        from guardian.shortcuts import assign_perm
-        
-        for org in queryset:
-            # Create organization member if doesn't exist
-            member, created = OrganizationMember.objects.get_or_create(
-                organization=org,
-                user=request.user,
-                defaults={
-                    'role': 'owner',
-                    'is_active': True,
-                    'created_by': request.user,
-                }
+        # Lock the selected rows, waiting for any concurrent action on them
+        organizations = list(
+            Organization.objects.lightweight().select_for_update().filter(
+                pk__in=queryset.values('pk')
             )
-            
-            # Update to owner if exists
-            if not created and member.role != 'owner':
-                member.role = 'owner'
-                member.is_active = True
-                member.save()
-            
-            # Assign permissions
-            assign_perm('view_organization', request.user, org)
-            assign_perm('manage_organization', request.user, org)
-            assign_perm('invite_members', request.user, org)
-            assign_perm('manage_sites', request.user, org)
+        )
+        existing = {
+            member.organization_id: member
+            for member in OrganizationMember.objects.filter(
+                organization__in=organizations, user=request.user
+            )
+        }
+        
+        # Create organization members that don't exist yet
+        bulk_create_with_history(
+            [
+                OrganizationMember(
+                    organization=org,
+                    user=request.user,
+                    role='owner',
+                    is_active=True,
+                    created_by=request.user,
+                )
+                for org in organizations if org.pk not in existing
+            ],
+            OrganizationMember, batch_size=500, default_user=request.user
+        )
+        
+        # Update existing memberships to owner
+        now = timezone.now()
+        to_promote = [member for member in existing.values() if member.role != 'owner']
+        for member in to_promote:
+            member.role = 'owner'
+            member.is_active = True
+            member.updated_at = now
+        bulk_update_with_history(
+            to_promote, OrganizationMember, ['role', 'is_active', 'updated_at'],
+            default_user=request.user
+        )
+        
+        # Assign owner permissions on every selected organization at once
+        bulk_assign_perms(
+            ['view_organization', 'manage_organization', 'invite_members', 'manage_sites'],
+            request.user, organizations
+        )
         
-        count = queryset.count()
+        count = len(organizations)
         self.message_user(
             request,
             f'You are now an owner of {count} organization(s).',
@@ -360,6 +506,7 @@ class OrganizationMemberAdmin(BaseModelAdmin, SimpleHistoryAdmin):
         'user__username', 'user__email', 'user__first_name', 'user__last_name',
         'organization__name', 'title', 'department'
     )
+    list_select_related = ('user', 'organization', 'created_by', 'modified_by')
     readonly_fields = ('joined_at', 'last_active', 'created_at', 'updated_at', 'created_by', 'modified_by')
     
     fieldsets = (
@@ -383,25 +530,27 @@ class OrganizationMemberAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     
     actions = ['make_owners', 'make_members', 'activate_members', 'deactivate_members', 'assign_to_all_org_sites']
     
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related(
-            'user', 'organization', 'created_by', 'modified_by'
-        )
-    
+    @transaction.atomic
     def make_owners(self, request, queryset):
         """Bulk action to make selected members owners"""
-        from guardian.shortcuts import assign_perm
-        
-        updated = 0
-        for member in queryset.filter(role='member'):
+        members = list(
+            queryset.filter(role='member').select_related('user', 'organization')
+            .select_for_update(of=('self',))
+        )
+        now = timezone.now()
+        for member in members:
             member.role = 'owner'
-            member.save()
-            
-            # Assign owner permissions
-            assign_perm('manage_organization', member.user, member.organization)
-            assign_perm('invite_members', member.user, member.organization)
-            assign_perm('manage_sites', member.user, member.organization)
-            updated += 1
+            member.updated_at = now
+        bulk_update_with_history(
+            members, OrganizationMember, ['role', 'updated_at'], default_user=request.user
+        )
+        
+        # Assign owner permissions
+        assign_object_perms(
+            ['manage_organization', 'invite_members', 'manage_sites'],
+            [(member.user, member.organization) for member in members]
+        )
+        updated = len(members)
         
         self.message_user(
             request,
@@ -410,20 +559,27 @@ class OrganizationMemberAdmin(BaseModelAdmin, SimpleHistoryAdmin):
         )
     make_owners.short_description = "Make selected members owners"
     
+    @transaction.atomic
     def make_members(self, request, queryset):
         """Bulk action to make selected owners members"""
-        from guardian.shortcuts import remove_perm
-        
-        updated = 0
-        for member in queryset.filter(role='owner'):
+        members = list(
+            queryset.filter(role='owner').select_related('user', 'organization')
+            .select_for_update(of=('self',))
+        )
+        now = timezone.now()
+        for member in members:
             member.role = 'member'
-            member.save()
-            
-            # Remove owner permissions (keep view permission)
-            remove_perm('manage_organization', member.user, member.organization)
-            remove_perm('invite_members', member.user, member.organization)
-            remove_perm('manage_sites', member.user, member.organization)
-            updated += 1
+            member.updated_at = now
+        bulk_update_with_history(
+            members, OrganizationMember, ['role', 'updated_at'], default_user=request.user
+        )
+        
+        # Remove owner permissions (keep view permission)
+        remove_object_perms(
+            ['manage_organization', 'invite_members', 'manage_sites'],
+            [(member.user, member.organization) for member in members]
+        )
+        updated = len(members)
         
         self.message_user(
             request,
@@ -452,19 +608,36 @@ class OrganizationMemberAdmin(BaseModelAdmin, SimpleHistoryAdmin):
         )
     deactivate_members.short_description = "Deactivate selected members"
     
+    @transaction.atomic
     def assign_to_all_org_sites(self, request, queryset):
         """Bulk action to assign selected members to all their organization's sites"""
-        from guardian.shortcuts import assign_perm
+        members = list(
+            queryset.filter(is_active=True).select_related('user')
+            .select_for_update(of=('self',))
+        )
+        org_sites = OrganizationSite.objects.filter(
+            organization_id__in={member.organization_id for member in members},
+            is_active=True
+        ).select_related('site')
+        sites_by_org = defaultdict(list)
+        for org_site in org_sites:
+            sites_by_org[org_site.organization_id].append(org_site.site)
         
-        total_assigned = 0
-        for member in queryset.filter(is_active=True):
-            org_sites = member.organization.organization_sites.filter(is_active=True)
-            for org_site in org_sites:
+        access_pairs = []
+        admin_pairs = []
+        for member in members:
+            for site in sites_by_org[member.organization_id]:
                 # Grant appropriate permissions based on role
-                assign_perm('access_site', member.user, org_site.site)
+                access_pairs.append((member.user, site))
                 if member.role == 'owner':
-                    assign_perm('admin_site', member.user, org_site.site)
-                total_assigned += 1
+                    admin_pairs.append((member.user, site))
+        
+        rows = build_object_perms(['access_site'], access_pairs)
+        rows += build_object_perms(['admin_site'], admin_pairs)
+        UserObjectPermission.objects.bulk_create(
+            rows, ignore_conflicts=True, batch_size=BULK_BATCH_SIZE
+        )
+        total_assigned = len(access_pairs)
         
         self.message_user(
             request,
@@ -483,6 +656,7 @@ class OrganizationSiteAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     )
     list_filter = ('is_primary', 'site_role', 'is_active', 'created_at')
     search_fields = ('organization__name', 'site__name', 'site__schema_name')
+    list_select_related = ('organization', 'site')
     readonly_fields = ('user_count', 'created_at', 'updated_at', 'created_by', 'modified_by')
     
     fieldsets = (
@@ -507,28 +681,40 @@ class OrganizationSiteAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     actions = ['grant_access_to_all_owners']
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related(
-            'organization', 'site', 'created_by', 'modified_by'
+        return super().get_queryset(request).annotate(
+            _user_count=users_with_perm_count(Site, 'access_site', 'site_id')
         )
     
     def user_count(self, obj):
         """Display count of users with access to this site"""
-        from guardian.shortcuts import get_users_with_perms
+        if hasattr(obj, '_user_count'):
+            return obj._user_count
         users = get_users_with_perms(obj.site, only_with_perms_in=['access_site'])
         return users.count()
     user_count.short_description = 'Users with Access'
+    user_count.admin_order_field = '_user_count'
     
     def grant_access_to_all_owners(self, request, queryset):
         """Grant site access to all owners of the organization"""
-        from guardian.shortcuts import assign_perm
+        org_sites = list(queryset.select_related('site'))
+        
+        # All owners of the selected sites' organizations in one query
+        owners_by_org = {}
+        for member in OrganizationMember.objects.select_related(None).select_related('user').filter(
+            organization_id__in={org_site.organization_id for org_site in org_sites},
+            role='owner',
+            is_active=True
+        ):
+            owners_by_org.setdefault(member.organization_id, []).append(member.user)
         
-        total_granted = 0
-        for org_site in queryset:
-            owners = org_site.organization.members.filter(role='owner', is_active=True)
-            for member in owners:
-                assign_perm('access_site', member.user, org_site.site)
-                assign_perm('admin_site', member.user, org_site.site)
-                total_granted += 1
+        # Permission ids come from the memoized lookup; one INSERT for every grant
+        pairs = [
+            (user, org_site.site)
+            for org_site in org_sites
+            for user in owners_by_org.get(org_site.organization_id, ())
+        ]
+        assign_object_perms(['access_site', 'admin_site'], pairs)
+        total_granted = len(pairs)
         
         self.message_user(
             request,
@@ -538,6 +724,28 @@ class OrganizationSiteAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     grant_access_to_all_owners.short_description = "Grant access to all organization owners"
 
 
+class InvitationStatusFilter(admin.SimpleListFilter):
+    """Filter invitations by accepted/pending/expired status"""
+    title = 'status'
+    parameter_name = 'status'
+    
+    def lookups(self, request, model_admin):
+        return (
+            ('accepted', 'Accepted'),
+            ('pending', 'Pending'),
+            ('expired', 'Expired'),
+        )
+    
+    def queryset(self, request, queryset):
+        if self.value() == 'accepted':
+            return queryset.filter(is_accepted=True)
+        if self.value() == 'pending':
+            return queryset.filter(is_accepted=False, expires_at__gt=Now())
+        if self.value() == 'expired':
+            return queryset.filter(is_accepted=False, expires_at__lte=Now())
+        return queryset
+
+
 @admin.register(OrganizationInvitation)
 class OrganizationInvitationAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     """Admin for Organization Invitations"""
@@ -545,8 +753,10 @@ class OrganizationInvitationAdmin(BaseModelAdmin, SimpleHistoryAdmin):
         'email', 'organization', 'role', 'invited_by', 'is_accepted',
         'expires_at', 'status_display', 'created_at'
     )
-    list_filter = ('role', 'is_accepted', 'expires_at', 'created_at')
+    list_filter = (InvitationStatusFilter, 'role', 'is_accepted', 'expires_at', 'created_at')
     search_fields = ('email', 'organization__name', 'invited_by__username')
+    list_select_related = ('organization', 'invited_by', 'accepted_by')
+    changelist_defer = ('message', 'metadata', 'token')
     readonly_fields = (
         'token', 'accepted_by', 'accepted_at', 'status_display',
         'created_at', 'updated_at', 'created_by', 'modified_by'
@@ -578,18 +788,21 @@ class OrganizationInvitationAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     actions = ['resend_invitations', 'extend_invitations', 'cancel_invitations']
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related(
-            'organization', 'invited_by', 'accepted_by', 'created_by', 'modified_by'
+        """Compute expiry in SQL so status can be rendered without per-row checks"""
+        return super().get_queryset(request).annotate(
+            _expired=Case(
+                When(expires_at__lt=Now(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
         )
     
     def status_display(self, obj):
         """Display invitation status with color"""
         if obj.is_accepted:
-            return format_html('<span style="color: green;">✓ Accepted</span>')
-        elif obj.is_expired():
-            return format_html('<span style="color: red;">✗ Expired</span>')
-        else:
-            return format_html('<span style="color: orange;">⏳ Pending</span>')
+            return _ACCEPTED_HTML
+        expired = obj._expired if hasattr(obj, '_expired') else obj.is_expired()
+        return _EXPIRED_HTML if expired else _PENDING_HTML
     status_display.short_description = 'Status'
     
     def save_model(self, request, obj, form, change):
@@ -601,9 +814,8 @@ class OrganizationInvitationAdmin(BaseModelAdmin, SimpleHistoryAdmin):
         
         # Send invitation email for new invitations
         if is_new:
-            from .tasks import send_organization_invitation_email
             try:
-                send_organization_invitation_email.delay(obj.id)
+                obj.send_invitation_email()
                 self.message_user(
                     request,
                     f'Invitation created and email queued for {obj.email}',
@@ -618,17 +830,20 @@ class OrganizationInvitationAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     
     def resend_invitations(self, request, queryset):
         """Bulk action to resend pending invitations"""
-        from .tasks import send_organization_invitation_email
+        from .tasks import send_invitation_emails_bulk
         
-        pending_invitations = queryset.filter(
+        invitation_ids = list(queryset.filter(
             is_accepted=False, 
             expires_at__gt=timezone.now()
-        )
+        ).values_list('id', flat=True))
         
-        for invitation in pending_invitations:
-            send_organization_invitation_email.delay(invitation.id)
+        # One task for the whole selection, queued once the action's transaction commits
+        if invitation_ids:
+            transaction.on_commit(
+                lambda: send_invitation_emails_bulk.delay(invitation_ids), robust=True
+            )
         
-        count = pending_invitations.count()
+        count = len(invitation_ids)
         self.message_user(
             request,
             f'Queued {count} invitation email(s) for sending.',
@@ -653,8 +868,8 @@ class OrganizationInvitationAdmin(BaseModelAdmin, SimpleHistoryAdmin):
     
     def cancel_invitations(self, request, queryset):
         """Bulk action to cancel invitations"""
-        count = queryset.filter(is_accepted=False).count()
-        queryset.filter(is_accepted=False).delete()
+        _, deleted = queryset.filter(is_accepted=False).delete()
+        count = deleted.get(OrganizationInvitation._meta.label, 0)
         
         self.message_user(
             request,
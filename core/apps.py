@@ -8,4 +8,11 @@ class CoreConfig(AppConfig):
     def ready(self):
         # Import signals if needed (currently disabled for direct admin approach)
         # from . import signals
-        pass
+        
+        # Hand security and API request log I/O to background threads. Only the
+        # handlers are swapped here; each (forked) process starts its own
+        # listener on first use, so gunicorn and Celery workers keep logging
+        from django.conf import settings
+        if getattr(settings, 'LOG_QUEUE_ENABLED', True):
+            from taruvi_project.log_queue import enable_queue_logging
+            enable_queue_logging('security', 'api')
@@ -1,34 +1,164 @@
 from django.http import JsonResponse
 from django.views.decorators.cache import cache_page
 from django_ratelimit.decorators import ratelimit
+from django_ratelimit.exceptions import Ratelimited
+from django_ratelimit.core import (
+    EXPIRATION_FUDGE, _SIMPLE_KEYS, _get_window, _make_cache_key, _method_match, _split_rate,
+)
 from django.conf import settings
-from functools import wraps
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+from functools import lru_cache, wraps
+import hashlib
+import hmac
 import logging
 
 logger = logging.getLogger('security')
 
+# Resolved on first use, once settings are ready
+_PUBLIC_SCHEMA = SimpleLazyObject(lambda: getattr(settings, 'PUBLIC_SCHEMA_NAME', 'public'))
+
+
+def _hashable_methods(method):
+    """Turn a method list into a tuple so it can key the ratelimit cache"""
+    return tuple(method) if isinstance(method, list) else method
+
+
+@lru_cache(maxsize=64)
+def _make_ratelimit(group, key, rate, methods, block):
+    """
+    Build (and memoize) a configured ratelimit decorator
+    """
+    return ratelimit(group=group, key=key, rate=rate, method=methods, block=block)
+
 
 def conditional_ratelimit(group=None, key=None, rate=None, method=None, block=True):
     """
     Conditional rate limiting decorator that respects the RATE_LIMIT_ENABLE setting
     """
     def decorator(func):
+        # Build the rate-limited view once rather than on every request
+        rate_limited = _make_ratelimit(
+            group,
+            key or 'ip',
+            rate or f"{settings.API_RATE_LIMIT_PER_MINUTE}/m",
+            _hashable_methods(method or ['GET', 'POST']),
+            block
+        )(func)
+        
         @wraps(func)
         def wrapper(request, *args, **kwargs):
             # Check if rate limiting is enabled
             if not getattr(settings, 'RATE_LIMIT_ENABLE', True):
                 return func(request, *args, **kwargs)
             
-            # Apply rate limiting
-            rate_limit_decorator = ratelimit(
-                group=group,
-                key=key or 'ip',
-                rate=rate or f"{settings.API_RATE_LIMIT_PER_MINUTE}/m",
-                method=method or ['GET', 'POST'],
-                block=block
-            )
+            return rate_limited(request, *args, **kwargs)
+        
+        return wrapper
+    return decorator
+
+
+# Counts a request against every window in one round-trip. KEYS are the
+# django-ratelimit counter keys; ARGV holds (limit, ttl) per key.
+RATE_LIMIT_SCRIPT = """
+local limited = 0
+for i, key in ipairs(KEYS) do
+    local count = redis.call('INCR', key)
+    if count == 1 then
+        redis.call('EXPIRE', key, ARGV[2 * i])
+    end
+    if count > tonumber(ARGV[2 * i - 1]) then
+        limited = 1
+    end
+end
+return limited
+"""
+
+_rate_limit_scripts = {}
+
+
+def _rate_limit_specs():
+    """(group, key, rate, methods) for the named limits composite_rate_limit accepts"""
+    return {
+        'api': (
+            'api', 'user_or_ip', f"{getattr(settings, 'API_RATE_LIMIT_PER_MINUTE', 100)}/m",
+            ('GET', 'POST', 'PUT', 'DELETE', 'PATCH')
+        ),
+        'burst': (
+            'burst', 'user_or_ip', f"{getattr(settings, 'API_RATE_LIMIT_BURST', 10)}/s",
+            ('POST', 'PUT', 'DELETE', 'PATCH')
+        ),
+    }
+
+
+def _redis_rate_limit_script(cache):
+    """
+    The registered rate limit script for a django-redis cache, or None when
+    the cache isn't backed by Redis
+    """
+    if cache not in _rate_limit_scripts:
+        try:
+            from django_redis.cache import RedisCache
+        except ImportError:
+            RedisCache = None
+        script = None
+        if RedisCache is not None and isinstance(cache, RedisCache):
+            # redis-py runs it with EVALSHA and loads it on the first NOSCRIPT
+            script = cache.client.get_client(write=True).register_script(RATE_LIMIT_SCRIPT)
+        _rate_limit_scripts[cache] = script
+    return _rate_limit_scripts[cache]
+
+
+def composite_rate_limit(*names):
+    """
+    Enforce several named limits (see _rate_limit_specs) with a single Redis
+    round-trip. Counters are shared with the per-limit decorators; caches
+    other than Redis fall back to stacking them.
+    """
+    specs = [_rate_limit_specs()[name] for name in names]
+    
+    def decorator(func):
+        stacked = func
+        for group, key, rate, methods in reversed(specs):
+            stacked = conditional_ratelimit(group=group, key=key, rate=rate, method=list(methods))(stacked)
+        
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            if not getattr(settings, 'RATE_LIMIT_ENABLE', True) or not getattr(settings, 'RATELIMIT_ENABLE', True):
+                return func(request, *args, **kwargs)
+            
+            cache = caches[getattr(settings, 'RATELIMIT_USE_CACHE', 'default')]
+            script = _redis_rate_limit_script(cache)
+            if script is None:
+                return stacked(request, *args, **kwargs)
+            
+            keys, args_ = [], []
+            for group, key, rate, methods in specs:
+                if not _method_match(request, methods):
+                    continue
+                limit, period = _split_rate(rate)
+                value = _SIMPLE_KEYS[key](request)
+                window = _get_window(value, period)
+                keys.append(cache.make_key(_make_cache_key(group, window, rate, value, methods)))
+                args_ += [limit, period + EXPIRATION_FUDGE]
             
-            return rate_limit_decorator(func)(request, *args, **kwargs)
+            limited = False
+            if keys:
+                from redis.exceptions import RedisError
+                try:
+                    limited = bool(script(keys=keys, args=args_))
+                except RedisError as exc:
+                    logger.error(f"Rate limit check failed: {exc}")
+                    limited = not getattr(settings, 'RATELIMIT_FAIL_OPEN', False)
+            
+            request.limited = limited or getattr(request, 'limited', False)
+            if limited:
+                cls = getattr(settings, 'RATELIMIT_EXCEPTION_CLASS', Ratelimited)
+                raise (import_string(cls) if isinstance(cls, str) else cls)()
+            return func(request, *args, **kwargs)
         
         return wrapper
     return decorator
@@ -78,22 +208,20 @@ def conditional_cache(timeout=None, key_prefix=None, vary=None):
     Conditional caching decorator that respects cache settings
     """
     def decorator(func):
+        # Build the cached view once rather than on every request
+        cached = cache_page(
+            timeout or getattr(settings, 'API_CACHE_TTL', 300),
+            key_prefix=key_prefix,
+            vary=vary
+        )(func)
+        
         @wraps(func)
         def wrapper(request, *args, **kwargs):
             # Check if caching is enabled
-            cache_enabled = getattr(settings, 'API_CACHE_ENABLED', False)
-            if not cache_enabled:
+            if not getattr(settings, 'API_CACHE_ENABLED', False):
                 return func(request, *args, **kwargs)
             
-            # Apply caching
-            cache_timeout = timeout or getattr(settings, 'API_CACHE_TTL', 300)
-            cache_decorator = cache_page(
-                cache_timeout,
-                key_prefix=key_prefix,
-                vary=vary
-            )
-            
-            return cache_decorator(func)(request, *args, **kwargs)
+            return cached(request, *args, **kwargs)
         
         return wrapper
     return decorator
@@ -106,12 +234,18 @@ def log_api_access(action=None):
     def decorator(func):
         @wraps(func)
         def wrapper(request, *args, **kwargs):
+            # Skip building the audit record when INFO is filtered out
+            if not logger.isEnabledFor(logging.INFO):
+                return func(request, *args, **kwargs)
+            
+            user = getattr(request, 'user', None)
+            
             # Log API access
             logger.info(
                 f"API Access: {action or func.__name__}",
                 extra={
                     'correlation_id': getattr(request, 'correlation_id', None),
-                    'user': str(request.user) if hasattr(request, 'user') else 'Anonymous',
+                    'user': (user.get_username() if user is not None else '') or 'Anonymous',
                     'method': request.method,
                     'path': request.get_full_path(),
                     'remote_addr': request.META.get('REMOTE_ADDR'),
@@ -127,14 +261,45 @@ def log_api_access(action=None):
     return decorator
 
 
+@lru_cache(maxsize=None)
+def _api_key_digests():
+    """
+    Map SHA-256 digests of the configured API keys to the encoded keys,
+    built once per process
+    """
+    return {
+        hashlib.sha256(key.encode()).digest(): key.encode()
+        for key in getattr(settings, 'VALID_API_KEYS', [])
+    }
+
+
+@receiver(setting_changed)
+def _reset_api_key_digests(setting, **kwargs):
+    """Rebuild the API key digests when VALID_API_KEYS is overridden"""
+    if setting == 'VALID_API_KEYS':
+        _api_key_digests.cache_clear()
+
+
+def _is_valid_api_key(api_key, api_key_digests):
+    """
+    Check an API key against the configured keys with an O(1) digest
+    lookup, confirming the match in constant time
+    """
+    api_key_bytes = api_key.encode()
+    stored = api_key_digests.get(hashlib.sha256(api_key_bytes).digest())
+    return stored is not None and hmac.compare_digest(stored, api_key_bytes)
+
+
 def require_api_key(header_name='X-API-Key'):
     """
     Decorator to require API key authentication
     """
+    meta_key = 'HTTP_' + header_name.upper().replace('-', '_')
+    
     def decorator(func):
         @wraps(func)
         def wrapper(request, *args, **kwargs):
-            api_key = request.META.get(f'HTTP_{header_name.upper().replace("-", "_")}')
+            api_key = request.META.get(meta_key)
             
             if not api_key:
                 logger.warning(
@@ -152,8 +317,8 @@ def require_api_key(header_name='X-API-Key'):
                 )
             
             # Validate API key (implement your validation logic)
-            valid_api_keys = getattr(settings, 'VALID_API_KEYS', [])
-            if valid_api_keys and api_key not in valid_api_keys:
+            api_key_digests = _api_key_digests()
+            if api_key_digests and not _is_valid_api_key(api_key, api_key_digests):
                 logger.warning(
                     "Invalid API key",
                     extra={
@@ -181,11 +346,10 @@ def tenant_required(func):
     """
     @wraps(func)
     def wrapper(request, *args, **kwargs):
-        from django_tenants.utils import get_tenant
-        
         try:
-            tenant = get_tenant(request)
-            if not tenant or tenant.schema_name == getattr(settings, 'PUBLIC_SCHEMA_NAME', 'public'):
+            # Set by TenantMainMiddleware; same lookup django_tenants' get_tenant() does
+            tenant = getattr(request, 'tenant', None)
+            if not tenant or tenant.schema_name == _PUBLIC_SCHEMA:
                 return JsonResponse(
                     {'error': 'Tenant context required'},
                     status=400
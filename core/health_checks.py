@@ -3,10 +3,17 @@ from django.db import connection
 from health_check.backends import BaseHealthCheckBackend
 from health_check.exceptions import HealthCheckException
 from celery import current_app as celery_app
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import redis
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
+# Shared across probes so TCP connections and TLS sessions are reused
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+
 
 class CeleryHealthCheck(BaseHealthCheckBackend):
     """Custom health check for Celery workers"""
@@ -15,19 +22,13 @@ class CeleryHealthCheck(BaseHealthCheckBackend):
     
     def check_status(self):
         try:
-            # Check if Celery workers are available
-            inspect = celery_app.control.inspect()
-            stats = inspect.stats()
+            # A ping broadcast returns on the first worker reply and carries no
+            # task payloads, unlike inspect().stats()/active()
+            pongs = celery_app.control.ping(timeout=0.5, limit=1)
             
-            if not stats:
+            if not pongs:
                 self.add_error(HealthCheckException("No Celery workers available"))
                 return
-            
-            # Check if workers are responsive
-            active = inspect.active()
-            if active is None:
-                self.add_error(HealthCheckException("Celery workers not responding"))
-                return
                 
         except Exception as e:
             self.add_error(HealthCheckException(f"Celery health check failed: {str(e)}"))
@@ -64,20 +65,12 @@ class DatabaseHealthCheck(BaseHealthCheckBackend):
     
     def check_status(self):
         try:
-            # Test basic connection
-            with connection.cursor() as cursor:
+            # Test basic connection on the raw DB-API cursor, skipping Django's
+            # cursor wrapper and tenant search_path bookkeeping
+            connection.ensure_connection()
+            with connection.connection.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 
-            # Check if we can access tenant schema
-            from django_tenants.utils import tenant_context, get_public_schema_name
-            from core.models import Client
-            
-            # Check public schema access
-            public_schema = get_public_schema_name()
-            if Client.objects.filter(schema_name=public_schema).exists():
-                # Test tenant access if we have tenants
-                pass
-                
         except Exception as e:
             self.add_error(HealthCheckException(f"Database health check failed: {str(e)}"))
 
@@ -94,25 +87,41 @@ class ExternalServiceHealthCheck(BaseHealthCheckBackend):
         try:
             # Check if configured external services are accessible
             external_services = getattr(settings, 'EXTERNAL_HEALTH_CHECKS', [])
+            if not external_services:
+                return
             
-            for service in external_services:
-                url = service.get('url')
-                timeout = service.get('timeout', 5)
-                name = service.get('name', url)
-                
-                try:
-                    response = requests.get(url, timeout=timeout)
-                    if response.status_code != 200:
+            # Probe all services in parallel over the shared pooled session
+            with ThreadPoolExecutor(max_workers=min(8, len(external_services))) as executor:
+                futures = {
+                    executor.submit(self._probe, service): service
+                    for service in external_services
+                }
+                for future in as_completed(futures):
+                    service = futures[future]
+                    name = service.get('name', service.get('url'))
+                    
+                    try:
+                        response = future.result()
+                        if response.status_code != 200:
+                            self.add_error(
+                                HealthCheckException(f"External service {name} returned {response.status_code}")
+                            )
+                    except requests.exceptions.RequestException as e:
                         self.add_error(
-                            HealthCheckException(f"External service {name} returned {response.status_code}")
+                            HealthCheckException(f"External service {name} unreachable: {str(e)}")
                         )
-                except requests.exceptions.RequestException as e:
-                    self.add_error(
-                        HealthCheckException(f"External service {name} unreachable: {str(e)}")
-                    )
                     
         except Exception as e:
             self.add_error(HealthCheckException(f"External service health check failed: {str(e)}"))
 
+    @staticmethod
+    def _probe(service):
+        """Request a single service; 'method' may be set to HEAD to skip the body"""
+        return _SESSION.request(
+            service.get('method', 'GET'),
+            service.get('url'),
+            timeout=service.get('timeout', 5),
+        )
+
     def identifier(self):
         return self.__class__.__name__
\ No newline at end of file
@@ -1,7 +1,10 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
-from guardian.shortcuts import assign_perm, remove_perm, get_perms
+from django.db import transaction
+from django.db.models.functions import Lower
+from guardian.shortcuts import assign_perm, remove_perm
 from core.models import Site, Organization, OrganizationMember
+from core.permissions import bulk_assign_perms, bulk_remove_perms
 
 
 class Command(BaseCommand):
@@ -29,13 +32,7 @@ class Command(BaseCommand):
     def list_site_access(self, options):
         """List site access for users"""
         if options['site']:
-            try:
-                site = Site.objects.get(name__icontains=options['site'])
-            except Site.DoesNotExist:
-                try:
-                    site = Site.objects.get(schema_name=options['site'])
-                except Site.DoesNotExist:
-                    raise CommandError(f'Site "{options["site"]}" not found')
+            site = self.get_site(options['site'])
             
             self.stdout.write(f'\nUsers with access to site "{site.name}":')
             self.stdout.write('-' * 50)
@@ -52,9 +49,13 @@ class Command(BaseCommand):
             self.stdout.write(f'\nSites accessible by user "{user.username}":')
             self.stdout.write('-' * 50)
             
-            sites = Site.objects.all()
+            # Prefetch the user's site permissions in bulk instead of querying per site
+            from guardian.core import ObjectPermissionChecker
+            sites = list(Site.objects.all())
+            checker = ObjectPermissionChecker(user)
+            checker.prefetch_perms(sites)
             for site in sites:
-                perms = get_perms(user, site)
+                perms = checker.get_perms(site)
                 if perms:
                     perm_list = ', '.join(perms)
                     self.stdout.write(f'{site.name}: {perm_list}')
@@ -78,12 +79,16 @@ class Command(BaseCommand):
         elif options['organization'] and options['role']:
             # Grant to all users with specific role in organization
             org = self.get_organization(options['organization'])
-            members = org.members.filter(role=options['role'], is_active=True)
+            users = User.objects.filter(
+                organization_memberships__organization=org,
+                organization_memberships__role=options['role'],
+                organization_memberships__is_active=True,
+            )
             
-            count = 0
-            for member in members:
-                assign_perm(permission, member.user, site)
-                count += 1
+            with transaction.atomic():
+                users = list(users)
+                bulk_assign_perms([permission], users, site)
+            count = len(users)
             
             self.stdout.write(
                 self.style.SUCCESS(f'Granted {permission} to {count} {options["role"]}s in {org.name} for site {site.name}')
@@ -109,12 +114,16 @@ class Command(BaseCommand):
         
         elif options['organization'] and options['role']:
             org = self.get_organization(options['organization'])
-            members = org.members.filter(role=options['role'], is_active=True)
+            users = User.objects.filter(
+                organization_memberships__organization=org,
+                organization_memberships__role=options['role'],
+                organization_memberships__is_active=True,
+            )
             
-            count = 0
-            for member in members:
-                remove_perm(permission, member.user, site)
-                count += 1
+            with transaction.atomic():
+                users = list(users)
+                bulk_remove_perms([permission], users, site)
+            count = len(users)
             
             self.stdout.write(
                 self.style.SUCCESS(f'Revoked {permission} from {count} {options["role"]}s in {org.name} for site {site.name}')
@@ -131,21 +140,40 @@ class Command(BaseCommand):
             raise CommandError(f'User "{identifier}" not found')
 
     def get_site(self, identifier):
-        """Get site by name or schema name"""
-        try:
-            return Site.objects.get(name__icontains=identifier)
-        except Site.DoesNotExist:
-            try:
-                return Site.objects.get(schema_name=identifier)
-            except Site.DoesNotExist:
-                raise CommandError(f'Site "{identifier}" not found')
+        """Get site by schema name or name"""
+        return self.get_by_identifier(Site, 'schema_name', identifier)
 
     def get_organization(self, identifier):
-        """Get organization by name or slug"""
-        try:
-            return Organization.objects.get(name__icontains=identifier)
-        except Organization.DoesNotExist:
+        """Get organization by slug or name"""
+        return self.get_by_identifier(Organization, 'slug', identifier)
+
+    def get_by_identifier(self, model, unique_field, identifier):
+        """
+        Look up by the unique field, then the exact name (case-insensitive),
+        then a name substring.
+
+        The exact name compares Lower('name') so Postgres can use the
+        *_name_lower_idx index; name__iexact compiles to UPPER() and can't.
+        Names aren't unique, so several matches are reported as ambiguous.
+        """
+        label = model._meta.verbose_name
+        lookups = (
+            model.objects.filter(**{unique_field: identifier}),
+            model.objects.alias(lname=Lower('name')).filter(lname=identifier.lower()),
+            model.objects.filter(name__icontains=identifier),
+        )
+        for queryset in lookups:
             try:
-                return Organization.objects.get(slug=identifier)
-            except Organization.DoesNotExist:
-                raise CommandError(f'Organization "{identifier}" not found')
\ No newline at end of file
+                return queryset.get()
+            except model.DoesNotExist:
+                continue
+            except model.MultipleObjectsReturned:
+                matches = ', '.join(
+                    f'{obj.name} ({getattr(obj, unique_field)})'
+                    for obj in queryset.order_by(unique_field)
+                )
+                raise CommandError(
+                    f'{label.capitalize()} "{identifier}" is ambiguous, matching: {matches}. '
+                    f'Use the {unique_field.replace("_", " ")} instead.'
+                )
+        raise CommandError(f'{label.capitalize()} "{identifier}" not found')
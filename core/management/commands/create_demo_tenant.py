@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from core.models import Client, Domain
+from django.db import transaction
+from core.models import Site, Domain
 
 
 class Command(BaseCommand):
@@ -16,25 +17,25 @@ class Command(BaseCommand):
         domain_name = options.get('domain') or f"{schema_name}.localhost"
 
         # Check if tenant already exists
-        if Client.objects.filter(schema_name=schema_name).exists():
+        if Site.objects.filter(schema_name=schema_name).exists():
             self.stdout.write(
                 self.style.WARNING(f'Tenant "{schema_name}" already exists!')
             )
             return
 
-        # Create tenant
+        # Create tenant and domain together so a failure leaves no orphan tenant
         try:
-            tenant = Client.objects.create(
-                schema_name=schema_name,
-                name=tenant_name,
-            )
-            
-            # Create domain
-            domain = Domain.objects.create(
-                domain=domain_name,
-                tenant=tenant,
-                is_primary=True
-            )
+            with transaction.atomic():
+                tenant = Site.objects.create(
+                    schema_name=schema_name,
+                    name=tenant_name,
+                )
+
+                domain = Domain.objects.create(
+                    domain=domain_name,
+                    tenant=tenant,
+                    is_primary=True
+                )
 
             self.stdout.write(
                 self.style.SUCCESS(f'✅ Tenant created successfully!')
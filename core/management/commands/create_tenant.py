@@ -1,5 +1,12 @@
+import re
+
 from django.core.management.base import BaseCommand, CommandError
-from core.models import Client, Domain
+from django.db import transaction
+from django.db.models import Value
+from core.models import Site, Domain
+
+# Postgres identifier: starts with a letter, at most 63 characters
+_SCHEMA_RE = re.compile(r'^[a-z][a-z0-9_]{0,62}$')
 
 
 class Command(BaseCommand):
@@ -18,35 +25,47 @@ class Command(BaseCommand):
         description = options.get('description', '')
 
         # Validate schema name
-        if not schema_name.islower() or ' ' in schema_name:
-            raise CommandError('Schema name must be lowercase and contain no spaces')
+        if not _SCHEMA_RE.fullmatch(schema_name):
+            raise CommandError(
+                'Schema name must start with a lowercase letter and contain only '
+                'lowercase letters, digits and underscores (max 63 characters)'
+            )
+
+        # Check for an existing tenant or domain in one round-trip; each
+        # branch is a LIMIT 1 probe of a unique index
+        taken = set(
+            Site.objects.filter(schema_name=schema_name)
+            .annotate(conflict=Value('schema')).values_list('conflict', flat=True)[:1]
+            .union(
+                Domain.objects.filter(domain=domain_name)
+                .annotate(conflict=Value('domain')).values_list('conflict', flat=True)[:1],
+                all=True
+            )
+        )
 
-        # Check if tenant already exists
-        if Client.objects.filter(schema_name=schema_name).exists():
+        if 'schema' in taken:
             raise CommandError(f'Tenant with schema "{schema_name}" already exists')
 
-        # Check if domain already exists
-        if Domain.objects.filter(domain=domain_name).exists():
+        if 'domain' in taken:
             raise CommandError(f'Domain "{domain_name}" already exists')
 
         try:
-            # Create tenant
-            self.stdout.write(f'Creating tenant: {name} ({schema_name})')
-            tenant = Client(
-                schema_name=schema_name,
-                name=name,
-                description=description
-            )
-            tenant.save()
-
-            # Create domain
-            self.stdout.write(f'Creating domain: {domain_name}')
-            domain = Domain(
-                domain=domain_name,
-                tenant=tenant,
-                is_primary=True
-            )
-            domain.save()
+            # Create tenant and domain in one transaction so a failure leaves no orphan tenant
+            with transaction.atomic():
+                self.stdout.write(f'Creating tenant: {name} ({schema_name})')
+                tenant = Site(
+                    schema_name=schema_name,
+                    name=name,
+                    description=description
+                )
+                tenant.save()
+
+                self.stdout.write(f'Creating domain: {domain_name}')
+                Domain.objects.create(
+                    domain=domain_name,
+                    tenant=tenant,
+                    is_primary=True
+                )
 
             self.stdout.write(
                 self.style.SUCCESS(
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from core.models import Client, Domain
+from django.db.models import Prefetch
+from core.models import Site, Domain
 
 
 class Command(BaseCommand):
@@ -15,22 +16,30 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         active_only = options['active_only']
         
-        queryset = Client.objects.all()
+        queryset = Site.objects.all()
         if active_only:
             queryset = queryset.filter(is_active=True)
             
-        tenants = queryset.order_by('created_on')
+        # One query for tenants and one for all of their domains
+        tenants = list(
+            queryset.order_by('created_on').prefetch_related(
+                Prefetch(
+                    'domains',
+                    queryset=Domain.objects.order_by('-is_primary'),
+                    to_attr='ordered_domains'
+                )
+            )
+        )
 
-        if not tenants.exists():
+        if not tenants:
             self.stdout.write(self.style.WARNING('No tenants found'))
             return
 
-        self.stdout.write(self.style.SUCCESS(f'Found {tenants.count()} tenants:'))
+        self.stdout.write(self.style.SUCCESS(f'Found {len(tenants)} tenants:'))
         self.stdout.write('')
 
         for tenant in tenants:
-            # Get domains for this tenant
-            domains = Domain.objects.filter(tenant=tenant).order_by('-is_primary')
+            domains = tenant.ordered_domains
             
             status = "✓" if tenant.is_active else "✗"
             self.stdout.write(f'{status} {tenant.name} ({tenant.schema_name})')
@@ -38,7 +47,7 @@ class Command(BaseCommand):
             if tenant.description:
                 self.stdout.write(f'   Description: {tenant.description}')
             
-            if domains.exists():
+            if domains:
                 self.stdout.write('   Domains:')
                 for domain in domains:
                     primary = " (primary)" if domain.is_primary else ""
@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.conf import settings
-from core.models import Client, Domain, SiteAuthConfig
+from django.db import transaction
+from core.models import Site, Domain
 
 
 User = get_user_model()
@@ -35,70 +36,63 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Setting up development environment...'))
         
-        # Create public tenant
-        public_tenant, created = Client.objects.get_or_create(
-            schema_name=settings.PUBLIC_SCHEMA_NAME,  # 'public'
-            defaults={
-                'name': 'Taruvi Public Schema',
-                'description': 'Main public schema for Taruvi platform',
-                'is_active': True,
-            }
-        )
+        # get_or_create wraps every lookup in its own savepoint; run the whole
+        # setup in one transaction and only write the rows that are missing
+        with transaction.atomic():
+            self.setup_public_tenant(options)
+            self.setup_admin_user(options)
+        
+        self.stdout.write('\n' + self.style.SUCCESS('Development environment setup complete!'))
+        self.stdout.write(f'You can now access:')
+        self.stdout.write(f'  • Admin: http://{options["domain"]}:8000/admin/')
+        self.stdout.write(f'  • API: http://{options["domain"]}:8000/api/')
+        self.stdout.write(f'  • Health: http://{options["domain"]}:8000/health/')
+
+    def setup_public_tenant(self, options):
+        """Create the public tenant and its domain if missing"""
+        public_tenant = Site.objects.filter(schema_name=settings.PUBLIC_SCHEMA_NAME).first()
         
-        if created:
+        if public_tenant is None:
+            # save() rather than bulk_create so django-tenants and history hooks run
+            public_tenant = Site(
+                schema_name=settings.PUBLIC_SCHEMA_NAME,  # 'public'
+                name='Taruvi Public Schema',
+                description='Main public schema for Taruvi platform',
+                is_active=True,
+            )
+            public_tenant.save()
             self.stdout.write(
                 self.style.SUCCESS(f'✓ Created public tenant: {public_tenant}')
             )
         else:
             self.stdout.write(f'✓ Public tenant already exists: {public_tenant}')
         
-        # Create domain
-        domain, created = Domain.objects.get_or_create(
-            domain=options['domain'],
-            defaults={
-                'tenant': public_tenant,
-                'is_primary': True,
-            }
-        )
+        domain = Domain.objects.filter(domain=options['domain']).first()
         
-        if created:
+        if domain is None:
+            domain = Domain.objects.create(
+                domain=options['domain'],
+                tenant=public_tenant,
+                is_primary=True,
+            )
             self.stdout.write(
                 self.style.SUCCESS(f'✓ Created domain: {domain}')
             )
         else:
             self.stdout.write(f'✓ Domain already exists: {domain}')
+
+    def setup_admin_user(self, options):
+        """Create the admin user if missing"""
+        admin_user = User.objects.filter(username=options['admin_username']).first()
         
-        # Create authentication configuration
-        auth_config, created = SiteAuthConfig.objects.get_or_create(
-            client=public_tenant,
-            defaults={
-                'allow_email_signup': True,
-                'allow_social_login': True,
-                'primary_provider': 'email',
-                'custom_oauth_settings': {
-                    'note': 'Add custom OAuth provider settings here for Keycloak, Okta, etc.'
-                }
-            }
-        )
-        
-        if created:
-            self.stdout.write(
-                self.style.SUCCESS('✓ Created authentication configuration')
+        if admin_user is None:
+            # Hash the password before the first save so the user is written once
+            admin_user = User(
+                username=options['admin_username'],
+                email=options['admin_email'],
+                is_staff=True,
+                is_superuser=True,
             )
-        else:
-            self.stdout.write('✓ Authentication configuration already exists')
-        
-        # Create admin user
-        admin_user, created = User.objects.get_or_create(
-            username=options['admin_username'],
-            defaults={
-                'email': options['admin_email'],
-                'is_staff': True,
-                'is_superuser': True,
-            }
-        )
-        
-        if created:
             admin_user.set_password(options['admin_password'])
             admin_user.save()
             self.stdout.write(
@@ -109,9 +103,3 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write(f'✓ Admin user already exists: {admin_user.username}')
-        
-        self.stdout.write('\n' + self.style.SUCCESS('Development environment setup complete!'))
-        self.stdout.write(f'You can now access:')
-        self.stdout.write(f'  • Admin: http://{options["domain"]}:8000/admin/')
-        self.stdout.write(f'  • API: http://{options["domain"]}:8000/api/')
-        self.stdout.write(f'  • Health: http://{options["domain"]}:8000/health/')
\ No newline at end of file
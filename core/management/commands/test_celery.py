@@ -1,3 +1,5 @@
+from celery import group
+from celery.exceptions import TimeoutError
 from django.core.management.base import BaseCommand
 from core.tasks import debug_task, send_email_task, process_data_task
 import time
@@ -20,79 +22,73 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Testing Celery tasks...'))
         self.stdout.write('')
 
+        tests = []
         if task_type in ['debug', 'all']:
-            self.test_debug_task()
+            tests.append(self.debug_task_test())
 
         if task_type in ['email', 'all']:
-            self.test_email_task()
+            tests.append(self.email_task_test())
 
         if task_type in ['process_data', 'all']:
-            self.test_process_data_task()
+            tests.append(self.process_data_task_test())
+
+        self.run_tests(tests)
 
         self.stdout.write('')
         self.stdout.write(self.style.SUCCESS('Task testing completed!'))
 
-    def test_debug_task(self):
-        self.stdout.write('Testing debug task...')
-        
-        # Execute task
-        result = debug_task.delay()
-        
-        self.stdout.write(f'Task ID: {result.id}')
-        self.stdout.write('Waiting for result...')
-        
-        # Wait for result (max 10 seconds)
+    def run_tests(self, tests):
+        """Dispatch all tasks at once so the wait is the slowest task, not the sum"""
+        job = group(signature for _, signature, _ in tests).apply_async()
+
+        for (name, _, _), result in zip(tests, job.results):
+            self.stdout.write(f'{name} task ID: {result.id}')
+        self.stdout.write('Waiting for results...')
+        self.stdout.write('')
+
+        # Wait for everything (max 15 seconds), collecting failures per task.
+        # Backends with native join (Redis pub/sub, RPC) notify on completion
+        # instead of being polled for each result.
+        join = job.join_native if job.supports_native_join else job.join
         try:
-            task_result = result.get(timeout=10)
+            outcomes = join(timeout=15, propagate=False, interval=0.1)
+        except TimeoutError:
+            outcomes = [
+                result.result if result.ready() else TimeoutError('The operation timed out.')
+                for result in job.results
+            ]
+
+        for (name, _, report), outcome in zip(tests, outcomes):
+            if isinstance(outcome, BaseException):
+                self.stdout.write(self.style.ERROR(f'✗ {name} task failed: {str(outcome)}'))
+            else:
+                report(outcome)
+
+    def debug_task_test(self):
+        def report(task_result):
             self.stdout.write(self.style.SUCCESS(f'✓ Debug task completed: {task_result}'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'✗ Debug task failed: {str(e)}'))
-        
-        self.stdout.write('')
 
-    def test_email_task(self):
-        self.stdout.write('Testing email task...')
-        
-        # Execute task
-        result = send_email_task.delay(
+        return 'Debug', debug_task.s(), report
+
+    def email_task_test(self):
+        def report(task_result):
+            self.stdout.write(self.style.SUCCESS(f'✓ Email task completed: {task_result}'))
+
+        signature = send_email_task.s(
             subject='Test Email from Celery',
             message='This is a test email sent from a Celery task.',
             recipient_list=['test@example.com']
         )
-        
-        self.stdout.write(f'Task ID: {result.id}')
-        self.stdout.write('Waiting for result...')
-        
-        # Wait for result (max 10 seconds)
-        try:
-            task_result = result.get(timeout=10)
-            self.stdout.write(self.style.SUCCESS(f'✓ Email task completed: {task_result}'))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'✗ Email task failed: {str(e)}'))
-        
-        self.stdout.write('')
+        return 'Email', signature, report
+
+    def process_data_task_test(self):
+        def report(task_result):
+            self.stdout.write(self.style.SUCCESS(f'✓ Data processing task completed'))
+            self.stdout.write(f'  Result: {task_result}')
 
-    def test_process_data_task(self):
-        self.stdout.write('Testing data processing task...')
-        
         test_data = {
             'user_id': 123,
             'action': 'test_action',
             'timestamp': time.time()
         }
-        
-        # Execute task
-        result = process_data_task.delay(test_data)
-        
-        self.stdout.write(f'Task ID: {result.id}')
-        self.stdout.write('Waiting for result...')
-        
-        # Wait for result (max 15 seconds)
-        try:
-            task_result = result.get(timeout=15)
-            self.stdout.write(self.style.SUCCESS(f'✓ Data processing task completed'))
-            self.stdout.write(f'  Result: {task_result}')
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f'✗ Data processing task failed: {str(e)}'))
-        
-        self.stdout.write('')
\ No newline at end of file
+        return 'Data processing', process_data_task.s(test_data), report
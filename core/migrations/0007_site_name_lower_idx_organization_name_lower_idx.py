@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-15 20:09
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_historicaldomain_historicalorganization_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='organization_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='site',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='site_name_lower_idx'),
+        ),
+    ]
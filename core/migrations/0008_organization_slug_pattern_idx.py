@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-15 20:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_site_name_lower_idx_organization_name_lower_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['slug'], name='organization_slug_pattern_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-15 20:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def demote_duplicate_primary_sites(apps, schema_editor):
+    """Keep only the most recently updated primary site per organization"""
+    OrganizationSite = apps.get_model('core', 'OrganizationSite')
+    
+    seen = set()
+    duplicates = []
+    for site_id, organization_id in OrganizationSite.objects.filter(
+        is_primary=True
+    ).order_by('organization_id', '-updated_at', '-id').values_list('id', 'organization_id'):
+        if organization_id in seen:
+            duplicates.append(site_id)
+        seen.add(organization_id)
+    
+    if duplicates:
+        OrganizationSite.objects.filter(id__in=duplicates).update(is_primary=False)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_organization_slug_pattern_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_duplicate_primary_sites, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='organizationsite',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('organization',), name='uniq_primary_site_per_org'),
+        ),
+    ]
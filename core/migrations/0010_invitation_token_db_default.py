@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-15 20:15
+
+from django.contrib.postgres.operations import CryptoExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_uniq_primary_site_per_org'),
+    ]
+
+    operations = [
+        CryptoExtension(),
+        migrations.AlterField(
+            model_name='historicalorganizationinvitation',
+            name='token',
+            field=models.CharField(db_default=models.Func(models.Func(models.Func(models.Value(32), function='gen_random_bytes', output_field=models.BinaryField()), models.Value('base64'), function='encode', output_field=models.CharField()), models.Value('+/='), models.Value('-_'), function='translate', output_field=models.CharField()), db_index=True, help_text='Invitation token', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='organizationinvitation',
+            name='token',
+            field=models.CharField(db_default=models.Func(models.Func(models.Func(models.Value(32), function='gen_random_bytes', output_field=models.BinaryField()), models.Value('base64'), function='encode', output_field=models.CharField()), models.Value('+/='), models.Value('-_'), function='translate', output_field=models.CharField()), help_text='Invitation token', max_length=64, unique=True),
+        ),
+    ]
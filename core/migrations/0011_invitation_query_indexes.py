@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-15 20:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_invitation_token_db_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='organizationinvitation',
+            name='core_organi_token_cd3e2d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='organizationinvitation',
+            name='core_organi_email_14743b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='organizationinvitation',
+            name='core_organi_expires_7843e2_idx',
+        ),
+        migrations.AddIndex(
+            model_name='organizationinvitation',
+            index=models.Index(fields=['token'], include=('organization', 'email', 'role', 'expires_at', 'is_accepted'), name='iv_token_cover'),
+        ),
+        migrations.AddIndex(
+            model_name='organizationinvitation',
+            index=models.Index(condition=models.Q(('is_accepted', False)), fields=['expires_at'], name='iv_pending_exp'),
+        ),
+    ]
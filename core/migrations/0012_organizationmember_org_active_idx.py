@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-15 20:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_invitation_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationmember',
+            index=models.Index(fields=['organization', 'is_active'], name='om_org_active_idx'),
+        ),
+    ]
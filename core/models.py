@@ -1,13 +1,59 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Exists, Func, OuterRef, Q, Value
+from django.db.models.functions import Lower, Now
 from django_tenants.models import TenantMixin, DomainMixin
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 from datetime import timedelta
+import copy
+import hashlib
+import re
 import secrets
 from simple_history.models import HistoricalRecords
 
+# Attempts at saving a new organization under a freshly generated slug
+SLUG_SAVE_ATTEMPTS = 3
+
+# ASCII punctuation slugify() drops, with hyphens folded into whitespace
+_SLUG_TRANS = str.maketrans({
+    **{c: None for c in map(chr, range(128)) if not (c.isalnum() or c.isspace() or c in '-_')},
+    '-': ' ',
+})
+
+
+def _fast_slugify(value):
+    """
+    slugify() for ASCII names using str.translate instead of regexes;
+    anything else still goes through Django's slugify()
+    """
+    if not value.isascii():
+        return slugify(value)
+    return '-'.join(value.lower().translate(_SLUG_TRANS).split()).strip('-_')
+
+
+# Invitation emails are rendered once with this in place of the token
+INVITATION_TOKEN_PLACEHOLDER = 'INVITATIONTOKENPLACEHOLDER'
+INVITATION_EMAIL_CACHE_TTL = 3600
+
+# Database-side equivalent of secrets.token_urlsafe(32) (needs pgcrypto)
+INVITATION_TOKEN_DB_DEFAULT = Func(
+    Func(
+        Func(Value(32), function='gen_random_bytes', output_field=models.BinaryField()),
+        Value('base64'),
+        function='encode',
+        output_field=models.CharField()
+    ),
+    Value('+/='),
+    Value('-_'),
+    function='translate',
+    output_field=models.CharField()
+)
+
+# Redis hash buffering member last_active timestamps until the next flush
+LAST_ACTIVE_BUFFER_KEY = 'om:last_active'
+
 
 class BaseModel(models.Model):
     """
@@ -75,6 +121,9 @@ class Site(TenantMixin):
             ('manage_site_users', 'Can manage site users'),
             ('admin_site', 'Can administer site'),
         ]
+        indexes = [
+            models.Index(Lower('name'), name='site_name_lower_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -87,6 +136,78 @@ class Domain(DomainMixin):
 
 # Organization Models (Public Schema Only)
 
+class OrganizationQuerySet(models.QuerySet):
+    """QuerySet helpers for Organization"""
+    
+    def with_counts(self):
+        """
+        Annotate member, owner and site counts so the get_*_count()
+        methods don't issue a COUNT query per organization
+        """
+        return self.annotate(
+            _member_count=Count('members', distinct=True),
+            _owner_count=Count('members', filter=Q(members__role='owner'), distinct=True),
+            _site_count=Count('organization_sites', distinct=True),
+        )
+    
+    def lightweight(self):
+        """
+        Load only the narrow columns list pages need, leaving out the
+        TEXT/JSON ones. Reading a deferred field such as description or
+        settings on the result costs one extra query per instance.
+        """
+        return self.only(
+            'id', 'name', 'slug', 'subscription_plan', 'is_active',
+            'is_verified', 'max_sites', 'max_members'
+        )
+    
+    def with_members(self):
+        """
+        Prefetch members and their users in separate IN queries rather
+        than joining them into (and duplicating) the organization rows
+        """
+        return self.prefetch_related('members__user')
+    
+    def for_admin_list(self):
+        """
+        Prefetch slim member rows and pending invitations for list pages.
+        
+        Pending invitations land in ``pending_invitations``; read the
+        prefetched ``members.all()`` rather than filtering it, as any
+        further filter() issues a fresh query per organization.
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                'members',
+                queryset=OrganizationMember.objects.select_related(None).select_related('user').only(
+                    'id', 'organization_id', 'user_id', 'role', 'is_active',
+                    'user__id', 'user__username', 'user__first_name', 'user__last_name', 'user__email'
+                )
+            ),
+            models.Prefetch(
+                'invitations',
+                queryset=OrganizationInvitation.objects.select_related(None).filter(
+                    is_accepted=False, expires_at__gt=Now()
+                ),
+                to_attr='pending_invitations'
+            ),
+        )
+
+
+class OrganizationMemberManager(models.Manager):
+    """Default manager that joins the relations used by __str__"""
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('user', 'organization')
+
+
+class OrganizationInvitationManager(models.Manager):
+    """Default manager that joins the relations used by __str__ and listings"""
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('organization', 'invited_by', 'accepted_by')
+
+
 class Organization(BaseModel):
     """
     Organization model - custom implementation without django-organizations.
@@ -128,6 +249,8 @@ class Organization(BaseModel):
     # Historical records
     history = HistoricalRecords()
     
+    objects = OrganizationQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Organization'
         verbose_name_plural = 'Organizations'
@@ -138,39 +261,67 @@ class Organization(BaseModel):
         ]
         indexes = [
             models.Index(fields=['slug']),
+            models.Index(
+                fields=['slug'], name='organization_slug_pattern_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
             models.Index(fields=['is_active', 'is_verified']),
+            models.Index(Lower('name'), name='organization_name_lower_idx'),
         ]
     
     def __str__(self):
         return self.name
     
     def save(self, *args, **kwargs):
-        if not self.slug:
+        if self.slug:
+            return super().save(*args, **kwargs)
+        
+        # The unique constraint settles races with concurrent creates
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
             self.slug = self.generate_unique_slug()
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
     
     def generate_unique_slug(self):
         """Generate a unique slug for the organization"""
-        base_slug = slugify(self.name)
-        slug = base_slug
-        counter = 1
+        base_slug = _fast_slugify(self.name)
         
-        while Organization.objects.filter(slug=slug).exists():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
+        # Fetch the base slug and all its numbered variants in one query
+        existing = set(
+            Organization.objects.filter(
+                slug__regex=rf'^{re.escape(base_slug)}(-[0-9]+)?$'
+            ).values_list('slug', flat=True)
+        )
+        if base_slug not in existing:
+            return base_slug
         
-        return slug
+        prefix_len = len(base_slug) + 1
+        max_suffix = max(
+            (int(slug[prefix_len:]) for slug in existing if slug != base_slug),
+            default=0
+        )
+        return f"{base_slug}-{max_suffix + 1}"
     
     def get_member_count(self):
         """Get total member count"""
+        if hasattr(self, '_member_count'):
+            return self._member_count
         return self.members.count()
     
     def get_owner_count(self):
         """Get total owner count"""
+        if hasattr(self, '_owner_count'):
+            return self._owner_count
         return self.members.filter(role='owner').count()
     
     def get_site_count(self):
         """Get total site count"""
+        if hasattr(self, '_site_count'):
+            return self._site_count
         return self.organization_sites.count()
     
     def can_add_member(self):
@@ -225,6 +376,8 @@ class OrganizationMember(BaseModel):
     # Historical records
     history = HistoricalRecords()
     
+    objects = OrganizationMemberManager()
+    
     class Meta:
         verbose_name = 'Organization Member'
         verbose_name_plural = 'Organization Members'
@@ -232,6 +385,9 @@ class OrganizationMember(BaseModel):
         indexes = [
             models.Index(fields=['organization', 'role']),
             models.Index(fields=['user', 'is_active']),
+            # Active-member lists and counts per organization; (organization, user)
+            # lookups already use the unique_together index
+            models.Index(fields=['organization', 'is_active'], name='om_org_active_idx'),
         ]
     
     def __str__(self):
@@ -242,9 +398,26 @@ class OrganizationMember(BaseModel):
         return self.role == 'owner'
     
     def update_last_active(self):
-        """Update last active timestamp"""
+        """
+        Update last active timestamp.
+        
+        The timestamp is buffered in Redis and written to the database in
+        bulk by the flush_member_last_active task; without a Redis cache
+        it is saved directly.
+        """
         self.last_active = timezone.now()
-        self.save(update_fields=['last_active'])
+        try:
+            from django_redis import get_redis_connection
+            redis_client = get_redis_connection('default')
+        except NotImplementedError:
+            # Activity pings are too frequent to be worth a history row each
+            self.skip_history_when_saving = True
+            try:
+                self.save(update_fields=['last_active'])
+            finally:
+                del self.skip_history_when_saving
+            return
+        redis_client.hset(LAST_ACTIVE_BUFFER_KEY, self.pk, self.last_active.timestamp())
 
 
 class OrganizationSite(BaseModel):
@@ -294,19 +467,46 @@ class OrganizationSite(BaseModel):
             models.Index(fields=['organization', 'is_active']),
             models.Index(fields=['site', 'is_active']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organization'],
+                condition=Q(is_primary=True),
+                name='uniq_primary_site_per_org'
+            ),
+        ]
     
     def __str__(self):
         primary = " (Primary)" if self.is_primary else ""
         return f"{self.organization.name} → {self.site.name}{primary}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored flag so save() can skip needless demotions
+        instance._loaded_is_primary = instance.__dict__.get('is_primary')
+        return instance
+    
     def save(self, *args, **kwargs):
-        # Ensure only one primary site per organization
-        if self.is_primary:
+        # Only a site becoming primary needs to demote the current one;
+        # uniq_primary_site_per_org enforces the invariant in the database
+        if not self.is_primary or getattr(self, '_loaded_is_primary', None) is True:
+            super().save(*args, **kwargs)
+        else:
+            try:
+                self._demote_and_save(*args, **kwargs)
+            except IntegrityError:
+                # A concurrent writer promoted another site first; demote it too
+                self._demote_and_save(*args, **kwargs)
+        self._loaded_is_primary = self.is_primary
+    
+    def _demote_and_save(self, *args, **kwargs):
+        """Demote the organization's current primary site and save in one transaction"""
+        with transaction.atomic():
             OrganizationSite.objects.filter(
-                organization=self.organization,
+                organization_id=self.organization_id,
                 is_primary=True
             ).exclude(pk=self.pk).update(is_primary=False)
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
 
 class OrganizationInvitation(BaseModel):
@@ -337,7 +537,12 @@ class OrganizationInvitation(BaseModel):
     )
     
     # Token and status
-    token = models.CharField(max_length=64, unique=True, help_text="Invitation token")
+    token = models.CharField(
+        max_length=64,
+        unique=True,
+        db_default=INVITATION_TOKEN_DB_DEFAULT,
+        help_text="Invitation token"
+    )
     is_accepted = models.BooleanField(default=False, help_text="Invitation has been accepted")
     accepted_by = models.ForeignKey(
         User,
@@ -357,14 +562,20 @@ class OrganizationInvitation(BaseModel):
     # Historical records
     history = HistoricalRecords()
     
+    objects = OrganizationInvitationManager()
+    
     class Meta:
         verbose_name = 'Organization Invitation'
         verbose_name_plural = 'Organization Invitations'
         unique_together = ('organization', 'email')
         indexes = [
-            models.Index(fields=['token']),
-            models.Index(fields=['email', 'is_accepted']),
-            models.Index(fields=['expires_at']),
+            # Covers the accept-by-token lookup as an index-only scan
+            models.Index(
+                fields=['token'], name='iv_token_cover',
+                include=['organization', 'email', 'role', 'expires_at', 'is_accepted']
+            ),
+            # Pending-expiry scans (cleanup, status filters) skip accepted rows
+            models.Index(fields=['expires_at'], condition=Q(is_accepted=False), name='iv_pending_exp'),
             models.Index(fields=['organization', 'is_accepted']),
         ]
     
@@ -373,9 +584,7 @@ class OrganizationInvitation(BaseModel):
         return f"{self.email} → {self.organization.name} ({status})"
     
     def save(self, *args, **kwargs):
-        # Generate token if not set
-        if not self.token:
-            self.token = secrets.token_urlsafe(32)
+        # New tokens come from the column's database default
         
         # Set expiration if not set
         if not self.expires_at:
@@ -385,25 +594,99 @@ class OrganizationInvitation(BaseModel):
         
         super().save(*args, **kwargs)
     
+    @classmethod
+    def bulk_invite(cls, organization, invited_by, emails, role='member', message=None):
+        """
+        Invite many email addresses to an organization at once.
+        
+        Addresses that already belong to an active member or already have
+        an invitation to the organization are skipped. The rest are
+        inserted in batches and their emails are queued as one Celery task
+        after commit. Returns the created invitations.
+        """
+        from django.conf import settings
+        from .tasks import send_invitation_emails_bulk
+        
+        emails = list(dict.fromkeys(email.strip().lower() for email in emails if email.strip()))
+        if not emails:
+            return []
+        
+        # Existing members and invitations for these addresses, in one query
+        taken = set(
+            User.objects.filter(
+                email__in=emails,
+                organization_memberships__organization=organization,
+                organization_memberships__is_active=True
+            ).values_list('email', flat=True).union(
+                cls.objects.filter(
+                    organization=organization, email__in=emails
+                ).values_list('email', flat=True)
+            )
+        )
+        emails = [email for email in emails if email not in taken]
+        if not emails:
+            return []
+        
+        expires_at = timezone.now() + timedelta(days=getattr(settings, 'INVITATION_EXPIRES_DAYS', 7))
+        cls.objects.bulk_create(
+            [
+                cls(
+                    organization=organization,
+                    invited_by=invited_by,
+                    created_by=invited_by,
+                    email=email,
+                    role=role,
+                    message=message,
+                    expires_at=expires_at,
+                )
+                for email in emails
+            ],
+            batch_size=500,
+            ignore_conflicts=True
+        )
+        
+        # ignore_conflicts leaves pks unset; reload the rows to get ids and tokens
+        invitations = list(
+            cls.objects.select_related(None).filter(
+                organization=organization, email__in=emails, is_accepted=False
+            )
+        )
+        cls.history.bulk_history_create(invitations, default_user=invited_by)
+        
+        invitation_ids = [invitation.id for invitation in invitations]
+        transaction.on_commit(
+            lambda: send_invitation_emails_bulk.delay(invitation_ids),
+            robust=True
+        )
+        return invitations
+    
     def clean(self):
         """Validate invitation"""
         super().clean()
         
+        # Check for an existing membership and a pending invitation in one query
+        member_exists, invite_exists = Organization.objects.filter(
+            pk=self.organization_id
+        ).annotate(
+            member_exists=Exists(User.objects.filter(
+                email=self.email,
+                organization_memberships__organization=OuterRef('pk'),
+                organization_memberships__is_active=True
+            )),
+            invite_exists=Exists(OrganizationInvitation.objects.filter(
+                organization=OuterRef('pk'),
+                email=self.email,
+                is_accepted=False,
+                expires_at__gt=timezone.now()
+            ).exclude(pk=self.pk)),
+        ).values_list('member_exists', 'invite_exists').get()
+        
         # Check if user is already a member
-        if User.objects.filter(
-            email=self.email,
-            organization_memberships__organization=self.organization,
-            organization_memberships__is_active=True
-        ).exists():
+        if member_exists:
             raise ValidationError(f"User with email {self.email} is already a member of {self.organization.name}")
         
         # Check if there's already a pending invitation
-        if OrganizationInvitation.objects.filter(
-            organization=self.organization,
-            email=self.email,
-            is_accepted=False,
-            expires_at__gt=timezone.now()
-        ).exclude(pk=self.pk).exists():
+        if invite_exists:
             raise ValidationError(f"There is already a pending invitation for {self.email}")
     
     def is_expired(self):
@@ -444,24 +727,24 @@ class OrganizationInvitation(BaseModel):
             if not member.is_active:
                 member.is_active = True
                 member.role = self.role
-                member.save()
+                member.save(update_fields=['is_active', 'role', 'updated_at'])
         
-        # Assign organization permissions via Guardian
-        from guardian.shortcuts import assign_perm
-        assign_perm('view_organization', user, self.organization)
+        # Assign organization permissions via Guardian in a single INSERT
+        from core.permissions import bulk_assign_perms
+        codenames = ['view_organization']
         
         # If owner role, assign management permissions
         if self.role == 'owner':
-            assign_perm('manage_organization', user, self.organization)
-            assign_perm('invite_members', user, self.organization)
-            assign_perm('manage_sites', user, self.organization)
+            codenames += ['manage_organization', 'invite_members', 'manage_sites']
+        
+        bulk_assign_perms(codenames, user, self.organization)
         
         # Mark invitation as accepted
         self.is_accepted = True
         self.accepted_by = user
         self.accepted_at = timezone.now()
         self.modified_by = user
-        self.save()
+        self.save(update_fields=['is_accepted', 'accepted_by', 'accepted_at', 'modified_by', 'updated_at'])
         
         return member
     
@@ -470,35 +753,93 @@ class OrganizationInvitation(BaseModel):
         self.token = secrets.token_urlsafe(32)
     
     def send_invitation_email(self):
-        """Send invitation email to the invited user"""
-        from django.core.mail import send_mail
-        from django.template.loader import render_to_string
+        """Queue the invitation email once the current transaction commits"""
+        from django.db import transaction
+        from .tasks import send_organization_invitation_email
+        
+        # Only the id is sent; the worker re-fetches the committed invitation
+        invitation_id = self.id
+        transaction.on_commit(
+            lambda: send_organization_invitation_email.delay(invitation_id),
+            robust=True
+        )
+    
+    def render_invitation_email(self):
+        """
+        Render the HTML and text invitation emails.
+        
+        Renders are cached per organization, inviter (and their display
+        name), role, expiry and message with a token placeholder, so a batch of invitations shares
+        one render and only the token is substituted per invitation.
+        """
         from django.conf import settings
+        from django.core.cache import cache
+        from django.template.loader import render_to_string
+        from django.utils import translation
         
-        # Build accept URL (this would need to be configured based on your frontend)
-        accept_url = f"{settings.FRONTEND_URL}/accept-invitation/{self.token}/" if hasattr(settings, 'FRONTEND_URL') else f"http://localhost:8000/api/organization-invitations/accept_invitation/"
+        # The templates show the inviter's display name, which can change
+        # without the invitation or organization changing
+        inviter = self.invited_by
+        inviter_name = (inviter.get_full_name() or inviter.username) if inviter is not None else ''
         
-        # Context for email templates
-        context = {
-            'invitation': self,
-            'organization': self.organization,
-            'invited_by': self.invited_by,
-            'accept_url': accept_url,
-            'message': self.message,
-        }
+        cache_key = 'invite_email:{}:{}:{}:{}:{}:{}:{}:{}'.format(
+            self.organization_id,
+            self.organization.updated_at.timestamp(),
+            self.invited_by_id,
+            hashlib.sha256(inviter_name.encode()).hexdigest()[:16],
+            self.role,
+            self.expires_at.strftime('%Y%m%d%H%M'),
+            hashlib.sha256((self.message or '').encode()).hexdigest(),
+            translation.get_language(),
+        )
+        
+        def render():
+            # Render against a copy carrying the placeholder instead of the token
+            invitation = copy.copy(self)
+            invitation.token = INVITATION_TOKEN_PLACEHOLDER
+            
+            # Build accept URL (this would need to be configured based on your frontend)
+            accept_url = f"{settings.FRONTEND_URL}/accept-invitation/{INVITATION_TOKEN_PLACEHOLDER}/" if hasattr(settings, 'FRONTEND_URL') else f"http://localhost:8000/api/organization-invitations/accept_invitation/"
+            
+            # Context for email templates
+            context = {
+                'invitation': invitation,
+                'organization': self.organization,
+                'invited_by': self.invited_by,
+                'accept_url': accept_url,
+                'message': self.message,
+            }
+            
+            return (
+                render_to_string('emails/organization_invitation.html', context),
+                render_to_string('emails/organization_invitation.txt', context),
+            )
         
-        # Render email templates
-        html_message = render_to_string('emails/organization_invitation.html', context)
-        text_message = render_to_string('emails/organization_invitation.txt', context)
+        html_message, text_message = cache.get_or_set(
+            cache_key, render, timeout=INVITATION_EMAIL_CACHE_TTL
+        )
+        return (
+            html_message.replace(INVITATION_TOKEN_PLACEHOLDER, self.token),
+            text_message.replace(INVITATION_TOKEN_PLACEHOLDER, self.token),
+        )
+    
+    def build_invitation_email(self, connection=None):
+        """Build the invitation email message, optionally bound to a shared connection"""
+        from django.core.mail import EmailMultiAlternatives
+        from django.conf import settings
         
-        # Send email
-        subject = f"Invitation to join {self.organization.name} on Taruvi"
+        html_message, text_message = self.render_invitation_email()
         
-        send_mail(
-            subject=subject,
-            message=text_message,
+        message = EmailMultiAlternatives(
+            subject=f"Invitation to join {self.organization.name} on Taruvi",
+            body=text_message,
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[self.email],
-            html_message=html_message,
-            fail_silently=False
+            to=[self.email],
+            connection=connection,
         )
+        message.attach_alternative(html_message, 'text/html')
+        return message
+    
+    def deliver_invitation_email(self):
+        """Render and send the invitation email to the invited user"""
+        self.build_invitation_email().send(fail_silently=False)
@@ -0,0 +1,253 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import (
+    BooleanField, CharField, Exists, ExpressionWrapper, F, Func, IntegerField, Model, OuterRef, Q,
+    Subquery,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from guardian.models import GroupObjectPermission, UserObjectPermission
+
+BULK_BATCH_SIZE = 1000
+
+
+def _as_list(value):
+    """Normalize a single instance or an iterable of instances to a list"""
+    if isinstance(value, Model):
+        return [value]
+    return list(value)
+
+
+# schema name -> content type id -> {codename: permission id}, filled on
+# first use. auth is a tenant app, so permission ids differ between schemas.
+_PERMISSION_IDS = {}
+
+
+def _content_type_permission_ids(content_type_id):
+    """Map every permission codename of a content type to its id in the current schema"""
+    schema_permission_ids = _PERMISSION_IDS.get(connection.schema_name)
+    if schema_permission_ids is None:
+        # The table is small and only changes on migrate, so load all of it
+        # in one query rather than one query per content type
+        schema_permission_ids = {}
+        for ct_id, codename, permission_id in Permission.objects.values_list(
+            'content_type_id', 'codename', 'id'
+        ):
+            schema_permission_ids.setdefault(ct_id, {})[codename] = permission_id
+        _PERMISSION_IDS[connection.schema_name] = schema_permission_ids
+    return schema_permission_ids.get(content_type_id, {})
+
+
+@receiver(post_migrate)
+def _reset_permission_ids(**kwargs):
+    """Permissions are (re)created by migrate, so drop the memoized ids"""
+    _PERMISSION_IDS.clear()
+
+
+def get_permission_ids(model, codenames):
+    """
+    Resolve permission codenames for a model to their ids.
+
+    The ids are memoized per schema, so only the first call in each
+    schema queries the database. Returns a dict mapping codename to
+    permission id.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    permission_ids = _content_type_permission_ids(content_type.id)
+    return {
+        codename: permission_ids[codename]
+        for codename in codenames
+        if codename in permission_ids
+    }
+
+
+def user_has_perm_expression(user, model, codename, object_ref='pk'):
+    """
+    Boolean expression telling whether user holds codename on the object
+    referenced by object_ref, through a direct or a group grant. Annotate
+    it to fold guardian's per-object has_perm check into the query that
+    loads the object. Superusers are not special-cased.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    permission_id = get_permission_ids(model, [codename]).get(codename)
+    grant = {
+        'content_type': content_type,
+        'permission_id': permission_id,
+        'object_pk': Cast(OuterRef(object_ref), output_field=CharField()),
+    }
+    return ExpressionWrapper(
+        Q(Exists(UserObjectPermission.objects.filter(user_id=user.pk, **grant)))
+        | Q(Exists(GroupObjectPermission.objects.filter(group__user=user.pk, **grant))),
+        output_field=BooleanField(),
+    )
+
+
+def users_with_perm_count(model, codename, object_ref):
+    """
+    Subquery counting the distinct users granted codename on the object
+    referenced by object_ref, directly or through a group (the users
+    get_users_with_perms returns), for annotating a queryset in one query
+    instead of calling get_users_with_perms per row.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    grant = {
+        'content_type': content_type,
+        'permission_id': get_permission_ids(model, [codename]).get(codename),
+        # Two levels out: past the user subquery to the annotated queryset
+        'object_pk': Cast(OuterRef(OuterRef(object_ref)), output_field=CharField()),
+    }
+    users = get_user_model().objects.filter(
+        Q(pk__in=UserObjectPermission.objects.filter(**grant).values('user_id'))
+        | Q(pk__in=GroupObjectPermission.objects.filter(**grant).values('group__user'))
+    ).order_by().annotate(c=Func(F('pk'), function='COUNT')).values('c')
+    return Coalesce(Subquery(users, output_field=IntegerField()), 0)
+
+
+def users_with_perm_filter(model, codename, object_ref):
+    """
+    Q filter matching objects (referenced by object_ref) on which at least
+    one user holds codename, directly or through a group
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    grant = {
+        'content_type': content_type,
+        'permission_id': get_permission_ids(model, [codename]).get(codename),
+        'object_pk': Cast(OuterRef(object_ref), output_field=CharField()),
+    }
+    return (
+        Q(Exists(UserObjectPermission.objects.filter(**grant)))
+        | Q(Exists(GroupObjectPermission.objects.filter(group__user__isnull=False, **grant)))
+    )
+
+
+def get_users_object_perms(users, obj):
+    """
+    Resolve several users' permission codenames on one object at once.
+
+    Equivalent to calling guardian's get_perms for each user (direct and
+    group grants, everything for active superusers, nothing for inactive
+    users) in a single query instead of one or more per user. Returns a
+    dict mapping user id to a sorted list of codenames.
+    """
+    users = _as_list(users)
+    content_type = ContentType.objects.get_for_model(obj)
+    object_pk = str(obj.pk)
+    active_ids = [user.pk for user in users if user.is_active and not user.is_superuser]
+
+    perms = {user.pk: set() for user in users}
+    if active_ids:
+        rows = UserObjectPermission.objects.filter(
+            content_type=content_type, object_pk=object_pk, user_id__in=active_ids
+        ).values_list('user_id', 'permission__codename').union(
+            GroupObjectPermission.objects.filter(
+                content_type=content_type, object_pk=object_pk, group__user__in=active_ids
+            ).values_list('group__user', 'permission__codename')
+        )
+        for user_id, codename in rows:
+            perms[user_id].add(codename)
+
+    all_codenames = None
+    for user in users:
+        if user.is_active and user.is_superuser:
+            if all_codenames is None:
+                all_codenames = set(_content_type_permission_ids(content_type.id))
+            perms[user.pk] = all_codenames
+
+    return {user_id: sorted(codenames) for user_id, codenames in perms.items()}
+
+
+def build_object_perms(codenames, pairs):
+    """
+    Build unsaved UserObjectPermission rows granting every codename
+    for each (user, obj) pair. All objects must be of the same model.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+
+    model = pairs[0][1].__class__
+    content_type = ContentType.objects.get_for_model(model)
+    permission_ids = get_permission_ids(model, codenames)
+    missing = set(codenames) - set(permission_ids)
+    if missing:
+        raise Permission.DoesNotExist(
+            f"Permissions {sorted(missing)} not found for {model._meta.label}"
+        )
+
+    return [
+        UserObjectPermission(
+            user_id=user.pk,
+            permission_id=permission_ids[codename],
+            content_type=content_type,
+            object_pk=str(obj.pk),
+        )
+        for user, obj in pairs
+        for codename in codenames
+    ]
+
+
+def assign_object_perms(codenames, pairs):
+    """
+    Grant every codename for each (user, obj) pair with a single INSERT.
+
+    Rows that already exist are skipped, matching guardian's assign_perm.
+    """
+    rows = build_object_perms(codenames, pairs)
+    if rows:
+        UserObjectPermission.objects.bulk_create(
+            rows, ignore_conflicts=True, batch_size=BULK_BATCH_SIZE
+        )
+    return len(rows)
+
+
+def remove_object_perms(codenames, pairs):
+    """
+    Revoke every codename for each (user, obj) pair with a single DELETE.
+    """
+    objects_by_user = {}
+    model = None
+    for user, obj in pairs:
+        model = obj.__class__
+        objects_by_user.setdefault(user.pk, set()).add(str(obj.pk))
+    if not objects_by_user:
+        return 0
+
+    pair_filter = Q()
+    for user_id, object_pks in objects_by_user.items():
+        pair_filter |= Q(user_id=user_id, object_pk__in=object_pks)
+
+    deleted, _ = UserObjectPermission.objects.filter(
+        pair_filter,
+        content_type=ContentType.objects.get_for_model(model),
+        permission__codename__in=codenames,
+    ).delete()
+    return deleted
+
+
+def bulk_assign_perms(codenames, users, objects):
+    """
+    Grant object permissions to every user on every object at once.
+
+    Equivalent to calling guardian's assign_perm for each codename, user
+    and object.
+    """
+    objects = _as_list(objects)
+    return assign_object_perms(
+        codenames, [(user, obj) for user in _as_list(users) for obj in objects]
+    )
+
+
+def bulk_remove_perms(codenames, users, objects):
+    """
+    Revoke object permissions from every user on every object at once.
+
+    Equivalent to calling guardian's remove_perm for each codename, user
+    and object.
+    """
+    objects = _as_list(objects)
+    return remove_object_perms(
+        codenames, [(user, obj) for user in _as_list(users) for obj in objects]
+    )
@@ -0,0 +1,34 @@
+from rest_framework.utils import encoders
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes compact responses with orjson.
+    
+    Types orjson doesn't handle natively (Decimal, lazy translations,
+    querysets, ...) go through DRF's JSONEncoder. Indented responses,
+    and anything orjson can't encode, fall back to the stock renderer.
+    """
+    _encoder_default = encoders.JSONEncoder().default
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # orjson only writes compact, non-ASCII-escaped output
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=self._encoder_default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Match JSONRenderer, which escapes these so the output stays a JavaScript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
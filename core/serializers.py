@@ -1,6 +1,11 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
+from django.utils.functional import cached_property
+from guardian.core import ObjectPermissionChecker
 from guardian.shortcuts import get_perms, get_objects_for_user
 
 from .models import (
@@ -9,20 +14,130 @@ from .models import (
 )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of once per
+    serializer instance; each instance gets shallow copies to bind.
+    
+    Set ``cache_fields = False`` on serializers whose fields depend on
+    the instance or context.
+    """
+    cache_fields = True
+    
+    def get_fields(self):
+        cls = type(self)
+        if not cls.cache_fields:
+            return super().get_fields()
+        
+        # Look in the class's own __dict__ so subclasses get their own cache
+        cached = cls.__dict__.get('_cached_fields')
+        if cached is None:
+            cached = super().get_fields()
+            cls._cached_fields = cached
+        
+        # List serializers hold a bound child, so they still need a deep copy
+        return {
+            name: copy.deepcopy(field) if isinstance(field, serializers.ListSerializer) else copy.copy(field)
+            for name, field in cached.items()
+        }
+
+
+class EagerLoadingMixin:
+    """
+    Lets viewsets join or prefetch the relations a serializer renders,
+    so nested fields don't issue one query per row
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class PermissionPrefetchListSerializer(serializers.ListSerializer):
+    """
+    Loads the requesting user's object permissions for the whole list in
+    one go (user and group rows) and shares the checker through the
+    context, so ``user_permissions`` doesn't query once per row.
+    
+    Children rendering the permissions of a related object set
+    ``permission_source`` to that attribute name.
+    """
+    
+    def to_representation(self, data):
+        request = self.context.get('request')
+        if request is None or not request.user.is_authenticated:
+            return super().to_representation(data)
+        
+        objects = list(data.all() if hasattr(data, 'all') else data)
+        source = getattr(self.child, 'permission_source', None)
+        targets = [getattr(obj, source) for obj in objects] if source else objects
+        
+        checker = self.context.get('permission_checker')
+        if checker is None:
+            checker = ObjectPermissionChecker(request.user)
+            self.context['permission_checker'] = checker
+        if targets:
+            checker.prefetch_perms(targets)
+        return super().to_representation(objects)
+
+
+class RequestUserMixin:
+    """
+    Resolves the authenticated request user once per serializer instance.
+    List children and nested serializers are shared by every row, so
+    per-row methods don't repeat the context and is_authenticated lookups.
+    """
+    
+    @cached_property
+    def request_user(self):
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            return request.user
+        return None
+
+
+def get_user_object_perms(serializer, obj):
+    """Current user's permissions on obj, from the list's prefetched checker if any"""
+    user = serializer.request_user
+    if user is None:
+        return []
+    checker = serializer.context.get('permission_checker')
+    if checker is not None:
+        return checker.get_perms(obj)
+    return get_perms(user, obj)
+
+
+class FullNameField(serializers.ReadOnlyField):
+    """
+    User's full name, falling back to the username. Reads straight off the
+    instance instead of going through SerializerMethodField dispatch.
+    """
+    
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+    
+    def get_attribute(self, instance):
+        return instance.get_full_name() or instance.username
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Basic user serializer"""
-    full_name = serializers.SerializerMethodField()
+    full_name = FullNameField()
     
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'is_active']
         read_only_fields = ['id', 'username', 'full_name']
-    
-    def get_full_name(self, obj):
-        return obj.get_full_name() or obj.username
 
 
-class SiteSerializer(serializers.ModelSerializer):
+class SiteSerializer(CachedFieldsMixin, RequestUserMixin, serializers.ModelSerializer):
     """Site/Tenant serializer"""
     user_permissions = serializers.SerializerMethodField()
     
@@ -30,16 +145,14 @@ class SiteSerializer(serializers.ModelSerializer):
         model = Site
         fields = ['schema_name', 'name', 'description', 'is_active', 'created_on', 'user_permissions']
         read_only_fields = ['schema_name', 'created_on', 'user_permissions']
+        list_serializer_class = PermissionPrefetchListSerializer
     
     def get_user_permissions(self, obj):
         """Get current user's permissions on this site"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return get_perms(request.user, obj)
-        return []
+        return get_user_object_perms(self, obj)
 
 
-class DomainSerializer(serializers.ModelSerializer):
+class DomainSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Domain serializer"""
     site_name = serializers.CharField(source='tenant.name', read_only=True)
     
@@ -50,7 +163,7 @@ class DomainSerializer(serializers.ModelSerializer):
 
 # Organization Serializers
 
-class OrganizationSerializer(serializers.ModelSerializer):
+class OrganizationSerializer(CachedFieldsMixin, RequestUserMixin, serializers.ModelSerializer):
     """Organization serializer with computed fields"""
     member_count = serializers.SerializerMethodField()
     owner_count = serializers.SerializerMethodField()
@@ -75,6 +188,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
             'can_add_member', 'can_add_site', 'user_permissions', 'user_role',
             'created_at', 'updated_at'
         ]
+        list_serializer_class = PermissionPrefetchListSerializer
     
     def get_member_count(self, obj):
         return obj.get_member_count()
@@ -93,24 +207,41 @@ class OrganizationSerializer(serializers.ModelSerializer):
     
     def get_user_permissions(self, obj):
         """Get current user's permissions on this organization"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return get_perms(request.user, obj)
-        return []
+        return get_user_object_perms(self, obj)
     
     def get_user_role(self, obj):
         """Get current user's role in this organization"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            try:
-                member = obj.members.get(user=request.user, is_active=True)
-                return member.role
-            except OrganizationMember.DoesNotExist:
-                return None
-        return None
+        user = self.request_user
+        if user is None:
+            return None
+        
+        # Prefetched by OrganizationViewSet; fall back to a query elsewhere
+        membership = getattr(obj, '_current_user_membership', None)
+        if membership is not None:
+            return membership[0].role if membership else None
+        try:
+            member = obj.members.get(user=user, is_active=True)
+            return member.role
+        except OrganizationMember.DoesNotExist:
+            return None
+
+
+class OrganizationListSerializer(OrganizationSerializer):
+    """
+    Organization serializer for list responses: identity, limits, counts
+    and the user's role, without the text/JSON columns
+    """
+    class Meta(OrganizationSerializer.Meta):
+        fields = [
+            'id', 'name', 'slug', 'subscription_plan', 'max_sites', 'max_members',
+            'is_active', 'is_verified', 'member_count', 'owner_count', 'site_count',
+            'can_add_member', 'can_add_site', 'user_role'
+        ]
+        # user_permissions isn't rendered, so there's nothing to prefetch
+        list_serializer_class = serializers.ListSerializer
 
 
-class OrganizationCreateSerializer(serializers.ModelSerializer):
+class OrganizationCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating organizations"""
     class Meta:
         model = Organization
@@ -133,19 +264,19 @@ class OrganizationCreateSerializer(serializers.ModelSerializer):
             created_by=self.context['request'].user,
         )
         
-        # Assign organization permissions via Guardian
-        from guardian.shortcuts import assign_perm
-        user = self.context['request'].user
-        assign_perm('view_organization', user, organization)
-        assign_perm('manage_organization', user, organization)
-        assign_perm('invite_members', user, organization)
-        assign_perm('manage_sites', user, organization)
+        # Assign organization permissions via Guardian in a single INSERT
+        from core.permissions import bulk_assign_perms
+        bulk_assign_perms(
+            ['view_organization', 'manage_organization', 'invite_members', 'manage_sites'],
+            self.context['request'].user, organization
+        )
         
         return organization
 
 
-class OrganizationMemberSerializer(serializers.ModelSerializer):
+class OrganizationMemberSerializer(CachedFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """Organization member serializer"""
+    select_related_fields = ('user', 'organization')
     user = UserSerializer(read_only=True)
     user_id = serializers.IntegerField(write_only=True, required=False)
     organization_name = serializers.CharField(source='organization.name', read_only=True)
@@ -185,20 +316,22 @@ class OrganizationMemberSerializer(serializers.ModelSerializer):
         member = super().create(validated_data)
         
         # Assign basic organization permissions
-        from guardian.shortcuts import assign_perm
-        assign_perm('view_organization', member.user, member.organization)
+        from core.permissions import bulk_assign_perms
+        codenames = ['view_organization']
         
         # If owner, assign additional permissions
         if member.role == 'owner':
-            assign_perm('manage_organization', member.user, member.organization)
-            assign_perm('invite_members', member.user, member.organization)
-            assign_perm('manage_sites', member.user, member.organization)
+            codenames += ['manage_organization', 'invite_members', 'manage_sites']
+        
+        bulk_assign_perms(codenames, member.user, member.organization)
         
         return member
 
 
-class OrganizationSiteSerializer(serializers.ModelSerializer):
+class OrganizationSiteSerializer(CachedFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """Organization site serializer"""
+    select_related_fields = ('site', 'organization')
+    permission_source = 'site'
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     site = SiteSerializer(read_only=True)
     site_id = serializers.CharField(source='site.schema_name', write_only=True, required=False)
@@ -214,9 +347,13 @@ class OrganizationSiteSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'organization_name', 'user_count', 'created_at', 'updated_at'
         ]
+        list_serializer_class = PermissionPrefetchListSerializer
     
     def get_user_count(self, obj):
         """Get count of users with access to this site"""
+        # Annotated by OrganizationSiteViewSet; fall back to a query elsewhere
+        if hasattr(obj, '_user_count'):
+            return obj._user_count
         from guardian.shortcuts import get_users_with_perms
         users = get_users_with_perms(obj.site, only_with_perms_in=['access_site'])
         return users.count()
@@ -240,8 +377,9 @@ class OrganizationSiteSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class OrganizationInvitationSerializer(serializers.ModelSerializer):
+class OrganizationInvitationSerializer(CachedFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     """Organization invitation serializer"""
+    select_related_fields = ('organization', 'invited_by', 'accepted_by')
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     invited_by = UserSerializer(read_only=True)
     accepted_by = UserSerializer(read_only=True)
@@ -274,9 +412,8 @@ class OrganizationInvitationSerializer(serializers.ModelSerializer):
         validated_data['created_by'] = self.context['request'].user
         invitation = super().create(validated_data)
         
-        # Send invitation email asynchronously
-        from .tasks import send_organization_invitation_email
-        send_organization_invitation_email.delay(invitation.id)
+        # Send invitation email asynchronously once the invitation is committed
+        invitation.send_invitation_email()
         
         return invitation
 
@@ -291,21 +428,30 @@ class AcceptInvitationSerializer(serializers.Serializer):
             invitation = OrganizationInvitation.objects.get(token=value)
             if not invitation.is_valid():
                 raise serializers.ValidationError("Invitation is no longer valid")
+            # Kept for save() so the invitation is only fetched once
+            self._invitation = invitation
             return value
         except OrganizationInvitation.DoesNotExist:
             raise serializers.ValidationError("Invalid invitation token")
     
     def save(self):
         """Accept invitation and send welcome email"""
-        token = self.validated_data['token']
         user = self.context['request'].user
         
-        invitation = OrganizationInvitation.objects.get(token=token)
-        member = invitation.accept(user)
+        invitation = getattr(self, '_invitation', None)
+        if invitation is None:
+            invitation = OrganizationInvitation.objects.get(token=self.validated_data['token'])
         
-        # Send welcome email asynchronously
-        from .tasks import send_organization_welcome_email
-        send_organization_welcome_email.delay(member.id)
+        with transaction.atomic():
+            member = invitation.accept(user)
+            
+            # Send welcome email asynchronously once the membership is committed
+            from .tasks import send_organization_welcome_email
+            member_id = member.id
+            transaction.on_commit(
+                lambda: send_organization_welcome_email.delay(member_id),
+                robust=True
+            )
         
         return member
 
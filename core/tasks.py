@@ -6,6 +6,8 @@ import time
 
 logger = get_task_logger(__name__)
 
+CLEANUP_BATCH_SIZE = 5000
+
 
 @shared_task
 def debug_task():
@@ -43,9 +45,6 @@ def process_data_task(data):
     """
     logger.info(f"Processing data: {data}")
     
-    # Simulate some processing time
-    time.sleep(2)
-    
     # Process the data (placeholder logic)
     processed_data = {
         'original': data,
@@ -109,7 +108,7 @@ def send_organization_invitation_email(self, invitation_id):
             return "Invitation no longer valid"
         
         # Send the invitation email
-        invitation.send_invitation_email()
+        invitation.deliver_invitation_email()
         
         logger.info(f"Organization invitation email sent to {invitation.email} for {invitation.organization.name}")
         return f"Invitation email sent to {invitation.email}"
@@ -128,6 +127,41 @@ def send_organization_invitation_email(self, invitation_id):
             raise exc
 
 
+@shared_task(bind=True, max_retries=3)
+def send_invitation_emails_bulk(self, invitation_ids):
+    """
+    Send invitation emails for many invitations over one mail connection
+    """
+    try:
+        from django.core.mail import get_connection
+        from django.utils import timezone
+        from .models import OrganizationInvitation
+        
+        # Only invitations that are still pending; accepted or expired ones are skipped
+        invitations = OrganizationInvitation.objects.filter(
+            id__in=invitation_ids,
+            is_accepted=False,
+            expires_at__gt=timezone.now()
+        )
+        
+        with get_connection(fail_silently=False) as connection:
+            messages = [invitation.build_invitation_email(connection) for invitation in invitations]
+            sent = connection.send_messages(messages) if messages else 0
+        
+        logger.info(f"Sent {sent} of {len(invitation_ids)} organization invitation emails")
+        return f"Sent {sent} invitation emails"
+        
+    except Exception as exc:
+        logger.error(f"Failed to send invitation emails for {len(invitation_ids)} invitations: {exc}")
+        
+        # Retry with exponential backoff
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+        else:
+            logger.error(f"Max retries reached for bulk invitation emails")
+            raise exc
+
+
 @shared_task
 def send_organization_welcome_email(member_id):
     """
@@ -184,14 +218,47 @@ def cleanup_expired_invitations():
     """
     Clean up expired organization invitations
     """
+    from django.db import transaction
     from django.utils import timezone
     from .models import OrganizationInvitation
     
+    HistoricalInvitation = OrganizationInvitation.history.model
+    now = timezone.now()
+    expired_count = 0
+    
     try:
-        expired_count = OrganizationInvitation.objects.filter(
-            is_accepted=False,
-            expires_at__lt=timezone.now()
-        ).delete()[0]
+        while True:
+            # One short transaction per batch. A plain queryset delete loads every
+            # row and writes its history one INSERT at a time from post_delete,
+            # so write the history rows in bulk and delete without signals.
+            with transaction.atomic():
+                batch = list(
+                    OrganizationInvitation.objects.select_related(None).filter(
+                        is_accepted=False,
+                        expires_at__lt=now
+                    ).order_by('pk').select_for_update(skip_locked=True)[:CLEANUP_BATCH_SIZE]
+                )
+                if not batch:
+                    break
+                
+                HistoricalInvitation.objects.bulk_create([
+                    HistoricalInvitation(
+                        history_date=now,
+                        history_type='-',
+                        history_change_reason='Expired',
+                        **{
+                            field.attname: getattr(invitation, field.attname)
+                            for field in HistoricalInvitation.tracked_fields
+                        }
+                    )
+                    for invitation in batch
+                ])
+                expired = OrganizationInvitation.objects.filter(
+                    pk__in=[invitation.pk for invitation in batch]
+                )
+                expired._raw_delete(expired.db)
+            
+            expired_count += len(batch)
         
         logger.info(f"Cleaned up {expired_count} expired invitations")
         return f"Cleaned up {expired_count} expired invitations"
@@ -202,36 +269,124 @@ def cleanup_expired_invitations():
 
 
 @shared_task
-def send_organization_notification_email(user_id, subject, message, organization_id=None):
+def flush_member_last_active():
     """
-    Send notification emails to organization members
+    Write buffered member last_active timestamps to the database in bulk
+    """
+    from datetime import datetime, timezone as dt_timezone
+    from django_redis import get_redis_connection
+    from .models import LAST_ACTIVE_BUFFER_KEY, OrganizationMember
+    
+    try:
+        redis_client = get_redis_connection('default')
+    except NotImplementedError:
+        # Not a django-redis cache (e.g. LocMemCache in DEBUG): update_last_active
+        # saves directly, so there is no buffer to flush
+        return "No Redis buffer to flush"
+    
+    # Read and clear the buffer atomically so no update is lost or applied twice
+    with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hgetall(LAST_ACTIVE_BUFFER_KEY)
+        pipe.delete(LAST_ACTIVE_BUFFER_KEY)
+        buffered, _ = pipe.execute()
+    
+    if not buffered:
+        return "No activity to flush"
+    
+    members = [
+        OrganizationMember(
+            id=int(member_id),
+            last_active=datetime.fromtimestamp(float(timestamp), tz=dt_timezone.utc)
+        )
+        for member_id, timestamp in buffered.items()
+    ]
+    OrganizationMember.objects.bulk_update(members, ['last_active'], batch_size=1000)
+    
+    logger.info(f"Flushed last_active for {len(members)} members")
+    return f"Flushed last_active for {len(members)} members"
+
+
+@shared_task
+def send_notifications_bulk(user_ids, subject, message, organization_id=None):
+    """
+    Send the same notification email to many users over one mail connection
     """
     try:
         from django.contrib.auth.models import User
+        from django.core.mail import send_mass_mail
         from .models import Organization
         
-        user = User.objects.get(id=user_id)
+        emails = list(
+            User.objects.filter(id__in=user_ids).exclude(email='').values_list('email', flat=True)
+        )
+        if not emails:
+            logger.warning(f"No recipients found for notification: {subject}")
+            return "No recipients found"
         
         # Add organization context if provided
         context_message = message
         if organization_id:
-            organization = Organization.objects.get(id=organization_id)
+            organization = Organization.objects.only('name').get(id=organization_id)
             context_message = f"Organization: {organization.name}\n\n{message}"
         
-        send_mail(
-            subject=subject,
-            message=context_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
+        # One message per recipient so addresses aren't disclosed to each other
+        sent = send_mass_mail(
+            tuple(
+                (subject, context_message, settings.DEFAULT_FROM_EMAIL, [email])
+                for email in emails
+            ),
             fail_silently=False
         )
         
-        logger.info(f"Notification email sent to {user.email}: {subject}")
-        return f"Notification sent to {user.email}"
+        logger.info(f"Notification email sent to {sent} users: {subject}")
+        return f"Notification sent to {sent} users"
         
-    except (User.DoesNotExist, Organization.DoesNotExist) as exc:
-        logger.error(f"User or Organization not found: {exc}")
+    except Organization.DoesNotExist as exc:
+        logger.error(f"Organization not found: {exc}")
         return str(exc)
     except Exception as exc:
-        logger.error(f"Failed to send notification email: {exc}")
-        raise exc
\ No newline at end of file
+        logger.error(f"Failed to send notification emails: {exc}")
+        raise exc
+
+
+@shared_task
+def send_organization_notification_email(user_id, subject, message, organization_id=None):
+    """
+    Send notification emails to organization members
+    """
+    return send_notifications_bulk(
+        [user_id], subject, message, organization_id=organization_id
+    )
+
+
+# Tenant-related async tasks
+
+@shared_task(bind=True, max_retries=3)
+def migrate_tenant_schema(self, schema_name):
+    """
+    Create a tenant schema and run its migrations asynchronously.
+    
+    An already existing schema (e.g. a retry after a failed migration) is
+    migrated in place.
+    """
+    try:
+        from django.core.management import call_command
+        from django_tenants.utils import schema_exists
+        from .models import Site
+        
+        site = Site.objects.filter(schema_name=schema_name).first()
+        if site is None:
+            logger.warning(f"Site for schema {schema_name} no longer exists")
+            return f"Site {schema_name} not found"
+        
+        if schema_exists(schema_name):
+            call_command('migrate_schemas', schema_name=schema_name, interactive=False, verbosity=0)
+        else:
+            site.create_schema(check_if_exists=True, verbosity=0)
+        
+        logger.info(f"Migrations applied to schema {schema_name}")
+        return f"Migrations applied to {schema_name}"
+        
+    except Exception as exc:
+        logger.error(f"Error migrating schema {schema_name}: {exc}")
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
@@ -1,3 +1,289 @@
-from django.test import TestCase
+import importlib
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from guardian.shortcuts import get_perms
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .models import (
+    LAST_ACTIVE_BUFFER_KEY,
+    Organization,
+    OrganizationInvitation,
+    OrganizationMember,
+    OrganizationSite,
+    Site,
+)
+from .permissions import bulk_assign_perms, bulk_remove_perms
+from .tasks import flush_member_last_active
+from .views import task_status
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class FakeRedis:
+    """In-memory stand-in for the django-redis client, covering the hash commands used here"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hset(self, key, field, value):
+        # Redis hands back bytes, whatever type was written
+        self.hashes.setdefault(key, {})[str(field).encode()] = str(value).encode()
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and runs them on execute(), like a redis-py pipeline"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def hgetall(self, key):
+        self.commands.append((self.client.hgetall, key))
+
+    def delete(self, key):
+        self.commands.append((self.client.delete, key))
+
+    def execute(self):
+        return [command(key) for command, key in self.commands]
+
+
+class MemberLastActiveTests(TestCase):
+    """Buffered last_active updates and their flush"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Acme')
+        cls.members = [
+            OrganizationMember.objects.create(
+                organization=cls.organization,
+                user=User.objects.create_user(f'user{i}', f'user{i}@example.com'),
+            )
+            for i in range(2)
+        ]
+
+    def test_buffered_updates_are_flushed_in_bulk(self):
+        redis = FakeRedis()
+        with mock.patch('django_redis.get_redis_connection', return_value=redis):
+            for member in self.members:
+                member.update_last_active()
+
+            # Only the buffer is written until the flush
+            self.assertEqual(len(redis.hashes[LAST_ACTIVE_BUFFER_KEY]), 2)
+            self.assertFalse(
+                OrganizationMember.objects.filter(last_active__isnull=False).exists()
+            )
+
+            with self.assertNumQueries(1):
+                flush_member_last_active()
+
+        self.assertNotIn(LAST_ACTIVE_BUFFER_KEY, redis.hashes)
+        for member in self.members:
+            member_last_active = OrganizationMember.objects.get(pk=member.pk).last_active
+            # The buffer stores float epoch seconds
+            self.assertAlmostEqual(
+                member_last_active.timestamp(), member.last_active.timestamp(), places=3
+            )
+
+    def test_flush_with_empty_buffer(self):
+        with mock.patch('django_redis.get_redis_connection', return_value=FakeRedis()):
+            self.assertEqual(flush_member_last_active(), "No activity to flush")
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_without_redis_updates_are_saved_directly(self):
+        member = self.members[0]
+        member.update_last_active()
+
+        self.assertEqual(OrganizationMember.objects.get(pk=member.pk).last_active, member.last_active)
+        self.assertEqual(flush_member_last_active(), "No Redis buffer to flush")
+
+
+def create_site(schema_name):
+    """Create a Site row without building its tenant schema"""
+    site = Site(schema_name=schema_name, name=schema_name.title())
+    site.auto_create_schema = False
+    site.save()
+    return site
+
+
+class BulkPermissionTests(TestCase):
+    """bulk_assign_perms / bulk_remove_perms against guardian's own checks"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f'user{i}') for i in range(2)]
+        cls.sites = [create_site(f'site{i}') for i in range(2)]
+
+    def test_assign_and_remove_round_trip(self):
+        bulk_assign_perms(['access_site', 'admin_site'], self.users, self.sites)
+        # Assigning again is a no-op rather than a duplicate-key error
+        bulk_assign_perms(['access_site'], self.users, self.sites)
+
+        for user in self.users:
+            for site in self.sites:
+                self.assertEqual(set(get_perms(user, site)), {'access_site', 'admin_site'})
+
+        bulk_remove_perms(['admin_site'], self.users, self.sites[0])
+
+        for user in self.users:
+            self.assertEqual(get_perms(user, self.sites[0]), ['access_site'])
+            self.assertEqual(set(get_perms(user, self.sites[1])), {'access_site', 'admin_site'})
+
+
+class OrganizationSlugTests(TestCase):
+    """Slug generation and the retry on a concurrent insert"""
+
+    def test_numbered_suffix(self):
+        Organization.objects.create(name='Acme')
+        Organization.objects.create(name='Acme')
+
+        self.assertEqual(Organization.objects.create(name='Acme').slug, 'acme-2')
+
+    def test_retries_when_slug_is_taken(self):
+        Organization.objects.create(name='Acme')
+
+        # Simulate a concurrent create claiming the slug after it was picked
+        with mock.patch.object(
+            Organization, 'generate_unique_slug', side_effect=['acme', 'acme-1']
+        ) as generate_unique_slug:
+            organization = Organization.objects.create(name='Acme')
+
+        self.assertEqual(generate_unique_slug.call_count, 2)
+        self.assertEqual(organization.slug, 'acme-1')
+        self.assertEqual(Organization.objects.filter(name='Acme').count(), 2)
+
+
+class BulkInviteTests(TestCase):
+    """OrganizationInvitation.bulk_invite"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Acme')
+        cls.owner = User.objects.create_user('owner', 'owner@example.com')
+        OrganizationMember.objects.create(organization=cls.organization, user=cls.owner, role='owner')
+        OrganizationInvitation.objects.create(
+            organization=cls.organization, invited_by=cls.owner, email='pending@example.com'
+        )
+
+    @mock.patch('core.tasks.send_invitation_emails_bulk.delay')
+    def test_skips_members_and_pending_invitations(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            invitations = OrganizationInvitation.bulk_invite(
+                self.organization,
+                self.owner,
+                ['Owner@example.com', 'pending@example.com', ' new@example.com', 'new@example.com', ''],
+            )
+
+        self.assertEqual([invitation.email for invitation in invitations], ['new@example.com'])
+        self.assertTrue(invitations[0].token)
+        delay.assert_called_once_with([invitations[0].id])
+
+    @mock.patch('core.tasks.send_invitation_emails_bulk.delay')
+    def test_nothing_to_invite(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            invitations = OrganizationInvitation.bulk_invite(
+                self.organization, self.owner, ['owner@example.com', 'pending@example.com']
+            )
+
+        self.assertEqual(invitations, [])
+        delay.assert_not_called()
+
+
+class PrimarySiteMigrationTests(TestCase):
+    """The data migration ahead of uniq_primary_site_per_org"""
+
+    migration = importlib.import_module('core.migrations.0009_uniq_primary_site_per_org')
+
+    def test_keeps_most_recently_updated_primary_site(self):
+        # Recreate the pre-migration state, where duplicates were possible
+        constraint = next(
+            c for c in OrganizationSite._meta.constraints if c.name == 'uniq_primary_site_per_org'
+        )
+        with connection.schema_editor() as schema_editor:
+            schema_editor.remove_constraint(OrganizationSite, constraint)
+
+        organization = Organization.objects.create(name='Acme')
+        other = Organization.objects.create(name='Other')
+        older, newer, not_primary, other_primary = OrganizationSite.objects.bulk_create([
+            OrganizationSite(organization=organization, site=create_site('older'), is_primary=True),
+            OrganizationSite(organization=organization, site=create_site('newer'), is_primary=True),
+            OrganizationSite(organization=organization, site=create_site('plain')),
+            OrganizationSite(organization=other, site=create_site('other'), is_primary=True),
+        ])
+        OrganizationSite.objects.filter(pk=older.pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+
+        self.migration.demote_duplicate_primary_sites(apps, None)
+
+        self.assertEqual(
+            set(OrganizationSite.objects.filter(is_primary=True).values_list('pk', flat=True)),
+            {newer.pk, other_primary.pk}
+        )
+
+
+@override_settings(RATE_LIMIT_ENABLE=False)
+class TaskStatusTests(TestCase):
+    """task_status, including the ?wait= long-poll"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('user')
+
+    def get_status(self, result, query=''):
+        request = APIRequestFactory().get(f'/api/tasks/status/abc/{query}')
+        force_authenticate(request, user=self.user)
+        with mock.patch('core.views.AsyncResult', return_value=result):
+            return task_status(request, 'abc')
+
+    def make_result(self, supports_native_join):
+        result = mock.Mock(state='SUCCESS', result=42)
+        result.backend.supports_native_join = supports_native_join
+        return result
+
+    def test_waits_on_native_join_backends(self):
+        result = self.make_result(supports_native_join=True)
+
+        response = self.get_status(result, '?wait=30')
+
+        # wait is capped at TASK_STATUS_MAX_WAIT
+        result.get.assert_called_once_with(timeout=5, interval=0.05, propagate=False)
+        self.assertEqual(
+            response.data, {'task_id': 'abc', 'status': 'SUCCESS', 'ready': True, 'result': 42}
+        )
+
+    def test_wait_ignored_without_native_join(self):
+        result = self.make_result(supports_native_join=False)
+
+        response = self.get_status(result, '?wait=2')
+
+        result.get.assert_not_called()
+        self.assertEqual(response.data['result'], 42)
+
+    def test_no_wait_by_default(self):
+        result = self.make_result(supports_native_join=True)
+
+        response = self.get_status(result)
+
+        result.get.assert_not_called()
+        self.assertTrue(response.data['ready'])
@@ -1,10 +1,11 @@
-from django.http import JsonResponse, HttpResponse
-from django.views.decorators.http import require_http_methods
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_http_methods
 from django.contrib.auth.models import User
 from django.db import transaction
-from django.db.models import Q, Count, Prefetch
+from django.db.models import Q, Count, Exists, OuterRef, Prefetch
 from django.utils import timezone
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, render
 
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import api_view, action, permission_classes
@@ -13,30 +14,44 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
-from guardian.shortcuts import assign_perm, remove_perm, get_objects_for_user, get_perms
+from guardian.shortcuts import get_objects_for_user
+from guardian.core import ObjectPermissionChecker
 from guardian.decorators import permission_required_or_403
 from django_tenants.utils import schema_context
 
+from celery.exceptions import TimeoutError as CeleryTimeoutError
 from celery.result import AsyncResult
+from celery.states import READY_STATES, SUCCESS
 from .tasks import debug_task, send_email_task, process_data_task
-from .decorators import api_rate_limit, auth_rate_limit, burst_rate_limit, log_api_access
+from .permissions import (
+    bulk_assign_perms, bulk_remove_perms, get_users_object_perms, user_has_perm_expression,
+    users_with_perm_count,
+)
+from .renderers import OrjsonRenderer
+from .decorators import api_rate_limit, auth_rate_limit, composite_rate_limit, log_api_access
 from django.db import connection
 
 from .models import Organization, OrganizationMember, OrganizationSite, OrganizationInvitation, Site, Domain
 from .serializers import (
-    OrganizationSerializer, OrganizationMemberSerializer, 
+    OrganizationSerializer, OrganizationListSerializer, OrganizationMemberSerializer, 
     OrganizationSiteSerializer, OrganizationInvitationSerializer,
     AcceptInvitationSerializer, SitePermissionSerializer
 )
 
+import hashlib
 import json
 import os
-import threading
+from itertools import islice
+
+# Longest long-poll task_status will hold a request open, in seconds
+TASK_STATUS_MAX_WAIT = 5.0
+
+# Sites loaded (and permission-checked) per batch when listing site permissions
+SITE_PERMISSION_CHUNK_SIZE = 500
 
 
 @api_view(['POST'])
-@api_rate_limit()
-@burst_rate_limit()
+@composite_rate_limit('api', 'burst')
 @log_api_access('test_celery_task')
 def test_celery_task(request):
     """Test endpoint to trigger Celery tasks"""
@@ -67,17 +82,39 @@ def test_celery_task(request):
 @api_rate_limit()
 @log_api_access('task_status')
 def task_status(request, task_id):
-    """Get status of a Celery task"""
+    """
+    Get status of a Celery task.
+    
+    Pass ``?wait=<seconds>`` (up to 5) to long-poll: the request returns
+    as soon as the task finishes instead of the client polling in a loop.
+    Only result backends that push completion (native join, e.g. Redis)
+    long-poll; on others (the django-db backend) ``wait`` is ignored and
+    the current state is returned, since waiting there would poll the
+    database while holding a worker.
+    """
     result = AsyncResult(task_id)
     
+    try:
+        wait = min(float(request.query_params.get('wait', 0)), TASK_STATUS_MAX_WAIT)
+    except ValueError:
+        wait = 0
+    if wait > 0 and result.backend.supports_native_join:
+        try:
+            result.get(timeout=wait, interval=0.05, propagate=False)
+        except CeleryTimeoutError:
+            pass
+    
+    # Each state read is a backend round trip until the task is ready; read it once
+    state = result.state
+    ready = state in READY_STATES
     response_data = {
         'task_id': task_id,
-        'status': result.status,
-        'ready': result.ready(),
+        'status': state,
+        'ready': ready,
     }
     
-    if result.ready():
-        if result.successful():
+    if ready:
+        if state == SUCCESS:
             response_data['result'] = result.result
         else:
             response_data['error'] = str(result.result)
@@ -85,26 +122,28 @@ def task_status(request, task_id):
     return Response(response_data)
 
 
+def _tenant_info_context(request):
+    """Everything the tenant info page shows; all of it is in memory already"""
+    current_tenant = connection.tenant
+    return {
+        'schema_name': connection.schema_name,
+        'tenant_name': current_tenant.name if hasattr(current_tenant, 'name') else 'N/A',
+        'host': request.get_host(),
+        'path': request.path,
+    }
+
+
+def _tenant_info_etag(request):
+    context = _tenant_info_context(request)
+    return hashlib.md5('\0'.join(context.values()).encode(), usedforsecurity=False).hexdigest()
+
+
+@cache_control(private=True, max_age=60)
+@etag(_tenant_info_etag)
 def tenant_info(request):
     """Simple view to show current tenant information"""
-    current_tenant = connection.tenant
-    schema_name = connection.schema_name
-    
-    html = f"""
-    <html>
-    <head><title>Tenant Info</title></head>
-    <body>
-        <h1>Tenant Information</h1>
-        <p><strong>Schema:</strong> {schema_name}</p>
-        <p><strong>Tenant:</strong> {current_tenant.name if hasattr(current_tenant, 'name') else 'N/A'}</p>
-        <p><strong>Domain:</strong> {request.get_host()}</p>
-        <p><strong>Request Path:</strong> {request.path}</p>
-        <hr>
-        <p><a href="/admin/">Go to Admin</a></p>
-    </body>
-    </html>
-    """
-    return HttpResponse(html)
+    # Browsers revalidate with If-None-Match and get a 304 without a render
+    return render(request, 'tenant_info.html', _tenant_info_context(request))
 
 
 def home(request):
@@ -112,6 +151,21 @@ def home(request):
     return tenant_info(request)
 
 
+def with_site_user_counts(queryset):
+    """Annotate OrganizationSite rows with the user count OrganizationSiteSerializer renders"""
+    return queryset.annotate(
+        _user_count=users_with_perm_count(Site, 'access_site', 'site_id')
+    )
+
+
+def lock_organization(organization):
+    """
+    Lock the organization's row until the end of the transaction, so
+    concurrent quota and last-owner checks against it run one at a time
+    """
+    list(Organization.objects.select_for_update().filter(pk=organization.pk).values_list('pk', flat=True))
+
+
 class GuardianPermissionMixin:
     """Mixin to add Guardian permission filtering to viewsets"""
     
@@ -121,20 +175,111 @@ class GuardianPermissionMixin:
         if user.is_superuser:
             return super().get_queryset()
         
-        # Get objects user has permission to view
-        model_class = self.queryset.model
-        permission = f'{model_class._meta.app_label}.view_{model_class._meta.model_name}'
-        return get_objects_for_user(user, permission, klass=model_class)
+        # get_queryset runs more than once per request (get_object, actions);
+        # build the Guardian-filtered queryset once per viewset instance
+        queryset = self.__dict__.get('_guardian_queryset')
+        if queryset is None:
+            # Get objects user has permission to view
+            model_class = self.queryset.model
+            permission = f'{model_class._meta.app_label}.view_{model_class._meta.model_name}'
+            # Filter the viewset's queryset so its prefetches and joins carry over
+            queryset = get_objects_for_user(user, permission, klass=super().get_queryset())
+            self._guardian_queryset = queryset
+        return queryset.all()
+    
+    def get_accessible_organizations(self, permission):
+        """
+        Organizations the user holds permission on, memoized per request.
+        The result is lazy and is meant to be used as a subquery.
+        """
+        cache = self.__dict__.setdefault('_accessible_organizations', {})
+        if permission not in cache:
+            cache[permission] = get_objects_for_user(self.request.user, permission, klass=Organization)
+        return cache[permission]
+
+
+class StreamingListMixin:
+    """
+    Adds a ``stream`` list action for bulk exports: the filtered queryset
+    is read with a server-side cursor and written out as one JSON array,
+    a batch at a time, so memory stays flat however many rows there are.
+    """
+    stream_chunk_size = 1000
+    
+    @action(detail=False, methods=['get'])
+    def stream(self, request):
+        """Stream every matching object as a JSON array, without pagination"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self._stream_json(queryset), content_type='application/json'
+        )
+    
+    def _stream_json(self, queryset):
+        renderer = OrjsonRenderer()
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        separator = b''
+        
+        yield b'['
+        while batch := list(islice(rows, self.stream_chunk_size)):
+            # Render the batch as an array and splice its items into the stream
+            rendered = renderer.render(self.get_serializer(batch, many=True).data)
+            yield separator + rendered[1:-1]
+            separator = b','
+        yield b']'
 
 
 class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
     """
     ViewSet for Organization management with Guardian permissions
     """
-    queryset = Organization.objects.all()
+    # Counts are annotated so get_*_count()/can_add_*() don't query per row
+    queryset = Organization.objects.with_counts()
     serializer_class = OrganizationSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'slug'
+    # Object permissions the detail actions check, annotated onto get_object()
+    annotated_perms = ('view_organization', 'manage_organization')
+    
+    def has_organization_perm(self, organization, codename):
+        """
+        Same answer as request.user.has_perm(codename, organization), read
+        from the annotation loaded by get_queryset when there is one
+        """
+        annotated = getattr(organization, f'_has_{codename}', None)
+        if annotated is not None:
+            return annotated
+        return self.request.user.has_perm(codename, organization)
+    
+    def get_serializer_class(self):
+        """Render the trimmed serializer for list responses"""
+        if self.action == 'list':
+            return OrganizationListSerializer
+        return super().get_serializer_class()
+    
+    def get_queryset(self):
+        """Prefetch the requesting user's membership for the serializer's user_role"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only load the columns OrganizationListSerializer renders
+            queryset = queryset.lightweight()
+        user = self.request.user
+        if self.detail and user.is_authenticated and user.is_active and not user.is_superuser:
+            # Load the action permission checks with the object (see has_organization_perm)
+            queryset = queryset.annotate(**{
+                f'_has_{codename}': user_has_perm_expression(user, Organization, codename)
+                for codename in self.annotated_perms
+            })
+        if user.is_authenticated:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'members',
+                    queryset=OrganizationMember.objects.select_related(None).filter(
+                        user=user, is_active=True
+                    ),
+                    to_attr='_current_user_membership'
+                )
+            )
+        return queryset
     
     def perform_create(self, serializer):
         """Create organization and assign creator as owner with all permissions"""
@@ -151,8 +296,7 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         
         # Assign all Guardian permissions to creator
         permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
-        for perm in permissions:
-            assign_perm(perm, self.request.user, organization)
+        bulk_assign_perms(permissions, self.request.user, organization)
     
     @action(detail=True, methods=['get'])
     def members(self, request, slug=None):
@@ -160,10 +304,12 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('manage_organization', organization):
+        if not self.has_organization_perm(organization, 'manage_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        members = OrganizationMember.objects.filter(organization=organization)
+        # The reverse manager hands every row the organization loaded above,
+        # so only the users need joining
+        members = organization.members.select_related('user')
         serializer = OrganizationMemberSerializer(members, many=True, context={'request': request})
         return Response(serializer.data)
     
@@ -173,38 +319,44 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('manage_organization', organization):
+        if not self.has_organization_perm(organization, 'manage_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         user_id = request.data.get('user_id')
         role = request.data.get('role', 'member')
         
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-        
-        # Check if user is already a member
-        if OrganizationMember.objects.filter(organization=organization, user=user).exists():
-            return Response({'error': 'User is already a member'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Create membership
-        member = OrganizationMember.objects.create(
-            organization=organization,
-            user=user,
-            role=role,
-            is_active=True,
-            created_by=request.user
-        )
-        
-        # Assign Guardian permissions based on role
-        if role == 'owner':
-            permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
-        else:
-            permissions = ['view_organization']
-        
-        for perm in permissions:
-            assign_perm(perm, user, organization)
+        with transaction.atomic():
+            lock_organization(organization)
+            
+            # Look up the user and whether they are already a member in one query
+            user = User.objects.filter(id=user_id).annotate(
+                is_member=Exists(OrganizationMember.objects.filter(
+                    organization=organization, user_id=OuterRef('pk')
+                ))
+            ).first()
+            if user is None:
+                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+            
+            # Check if user is already a member
+            if user.is_member:
+                return Response({'error': 'User is already a member'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Create membership
+            member = OrganizationMember.objects.create(
+                organization=organization,
+                user=user,
+                role=role,
+                is_active=True,
+                created_by=request.user
+            )
+            
+            # Assign Guardian permissions based on role
+            if role == 'owner':
+                permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
+            else:
+                permissions = ['view_organization']
+            
+            bulk_assign_perms(permissions, user, organization)
         
         serializer = OrganizationMemberSerializer(member, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -215,7 +367,7 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('manage_organization', organization):
+        if not self.has_organization_perm(organization, 'manage_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         user_id = request.data.get('user_id')
@@ -225,24 +377,26 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         except OrganizationMember.DoesNotExist:
             return Response({'error': 'Member not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Cannot remove yourself if you're the only owner
-        if (member.user == request.user and member.role == 'owner' and 
-            OrganizationMember.objects.filter(organization=organization, role='owner').count() == 1):
-            return Response({'error': 'Cannot remove the only owner'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Remove Guardian permissions
-        permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
-        for perm in permissions:
-            remove_perm(perm, member.user, organization)
-        
-        # Also remove site permissions for this organization
-        org_sites = OrganizationSite.objects.filter(organization=organization)
-        for org_site in org_sites:
+        with transaction.atomic():
+            lock_organization(organization)
+            
+            # Cannot remove yourself if you're the only owner
+            if (member.user_id == request.user.pk and member.role == 'owner' and 
+                not OrganizationMember.objects.filter(
+                    organization=organization, role='owner'
+                ).exclude(pk=member.pk).exists()):
+                return Response({'error': 'Cannot remove the only owner'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Remove Guardian permissions
+            permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
+            bulk_remove_perms(permissions, member.user, organization)
+            
+            # Also remove site permissions for this organization, across all its sites at once
             site_permissions = ['view_client', 'change_client', 'delete_client']
-            for perm in site_permissions:
-                remove_perm(perm, member.user, org_site.site)
-        
-        member.delete()
+            org_sites = Site.objects.filter(organization_sites__organization=organization).only('pk')
+            bulk_remove_perms(site_permissions, member.user, org_sites)
+            
+            member.delete()
         return Response({'message': 'Member removed successfully'}, status=status.HTTP_200_OK)
     
     @action(detail=True, methods=['get'])
@@ -251,10 +405,12 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('view_organization', organization):
+        if not self.has_organization_perm(organization, 'view_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        sites = OrganizationSite.objects.filter(organization=organization)
+        sites = OrganizationSiteSerializer.setup_eager_loading(
+            with_site_user_counts(OrganizationSite.objects.filter(organization=organization))
+        )
         serializer = OrganizationSiteSerializer(sites, many=True, context={'request': request})
         return Response(serializer.data)
     
@@ -264,31 +420,37 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('manage_organization', organization):
+        if not self.has_organization_perm(organization, 'manage_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         site_id = request.data.get('site_id')
         
-        try:
-            site = Site.objects.get(id=site_id)
-        except Site.DoesNotExist:
-            return Response({'error': 'Site not found'}, status=status.HTTP_404_NOT_FOUND)
-        
-        # Check if site is already assigned to this organization
-        if OrganizationSite.objects.filter(organization=organization, site=site).exists():
-            return Response({'error': 'Site is already assigned to this organization'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Check organization limits
-        current_sites_count = OrganizationSite.objects.filter(organization=organization).count()
-        if current_sites_count >= organization.max_sites:
-            return Response({'error': 'Organization site limit reached'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Create organization site
-        org_site = OrganizationSite.objects.create(
-            organization=organization,
-            site=site,
-            created_by=request.user
-        )
+        with transaction.atomic():
+            lock_organization(organization)
+            
+            # Look up the site and whether it is already assigned in one query
+            site = Site.objects.filter(id=site_id).annotate(
+                is_assigned=Exists(OrganizationSite.objects.filter(
+                    organization=organization, site_id=OuterRef('pk')
+                ))
+            ).first()
+            if site is None:
+                return Response({'error': 'Site not found'}, status=status.HTTP_404_NOT_FOUND)
+            
+            # Check if site is already assigned to this organization
+            if site.is_assigned:
+                return Response({'error': 'Site is already assigned to this organization'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Check organization limits against a fresh count taken under the lock
+            if OrganizationSite.objects.filter(organization=organization).count() >= organization.max_sites:
+                return Response({'error': 'Organization site limit reached'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Create organization site
+            org_site = OrganizationSite.objects.create(
+                organization=organization,
+                site=site,
+                created_by=request.user
+            )
         
         serializer = OrganizationSiteSerializer(org_site, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -299,35 +461,40 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('manage_organization', organization):
+        if not self.has_organization_perm(organization, 'manage_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         user_id = request.data.get('user_id')
         site_id = request.data.get('site_id')
         permissions_to_grant = request.data.get('permissions', ['view_client'])
         
-        try:
-            user = User.objects.get(id=user_id)
-            site = Site.objects.get(id=site_id)
-        except (User.DoesNotExist, Site.DoesNotExist):
+        # Fetch the user and site together with their organization checks
+        user = User.objects.filter(id=user_id).annotate(
+            is_member=Exists(OrganizationMember.objects.filter(
+                organization=organization, user_id=OuterRef('pk'), is_active=True
+            ))
+        ).first()
+        site = Site.objects.filter(id=site_id).annotate(
+            in_organization=Exists(OrganizationSite.objects.filter(
+                organization=organization, site_id=OuterRef('pk')
+            ))
+        ).first()
+        if user is None or site is None:
             return Response({'error': 'User or Site not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Check if user is organization member
-        if not OrganizationMember.objects.filter(organization=organization, user=user, is_active=True).exists():
+        if not user.is_member:
             return Response({'error': 'User is not an active organization member'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Check if site belongs to organization
-        if not OrganizationSite.objects.filter(organization=organization, site=site).exists():
+        if not site.in_organization:
             return Response({'error': 'Site does not belong to this organization'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Grant Guardian permissions
         valid_permissions = ['view_client', 'change_client', 'delete_client']
-        granted_permissions = []
-        
-        for perm in permissions_to_grant:
-            if perm in valid_permissions:
-                assign_perm(perm, user, site)
-                granted_permissions.append(perm)
+        granted_permissions = [perm for perm in permissions_to_grant if perm in valid_permissions]
+        if granted_permissions:
+            bulk_assign_perms(granted_permissions, user, site)
         
         return Response({
             'message': 'Site access granted successfully',
@@ -340,7 +507,7 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         organization = self.get_object()
         
         # Check permission
-        if not request.user.has_perm('manage_organization', organization):
+        if not self.has_organization_perm(organization, 'manage_organization'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         user_id = request.data.get('user_id')
@@ -354,10 +521,8 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
             return Response({'error': 'User or Site not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Revoke Guardian permissions
-        revoked_permissions = []
-        for perm in permissions_to_revoke:
-            remove_perm(perm, user, site)
-            revoked_permissions.append(perm)
+        revoked_permissions = list(permissions_to_revoke)
+        bulk_remove_perms(revoked_permissions, user, site)
         
         return Response({
             'message': 'Site access revoked successfully',
@@ -365,7 +530,7 @@ class OrganizationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class OrganizationMemberViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
+class OrganizationMemberViewSet(StreamingListMixin, GuardianPermissionMixin, viewsets.ModelViewSet):
     """
     ViewSet for Organization Member management
     """
@@ -377,11 +542,13 @@ class OrganizationMemberViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         """Filter members based on organization access"""
         user = self.request.user
         if user.is_superuser:
-            return self.queryset
+            queryset = self.queryset.all()
+        else:
+            # Get organizations user has access to
+            organizations = self.get_accessible_organizations('view_organization')
+            queryset = OrganizationMember.objects.filter(organization__in=organizations)
         
-        # Get organizations user has access to
-        organizations = get_objects_for_user(user, 'view_organization', klass=Organization)
-        return OrganizationMember.objects.filter(organization__in=organizations)
+        return self.get_serializer_class().setup_eager_loading(queryset)
     
     @action(detail=True, methods=['post'])
     def change_role(self, request, pk=None):
@@ -397,27 +564,30 @@ class OrganizationMemberViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         if new_role not in ['member', 'owner']:
             return Response({'error': 'Invalid role'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # If demoting from owner to member, ensure there's at least one owner left
-        if (member.role == 'owner' and new_role == 'member' and 
-            OrganizationMember.objects.filter(organization=organization, role='owner').count() == 1):
-            return Response({'error': 'Cannot demote the only owner'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Update role
-        old_role = member.role
-        member.role = new_role
-        member.modified_by = request.user
-        member.save()
-        
-        # Update Guardian permissions
-        if new_role == 'owner':
-            permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
-            for perm in permissions:
-                assign_perm(perm, member.user, organization)
-        else:
-            # Remove management permissions but keep view
-            permissions_to_remove = ['change_organization', 'delete_organization', 'manage_organization']
-            for perm in permissions_to_remove:
-                remove_perm(perm, member.user, organization)
+        with transaction.atomic():
+            lock_organization(organization)
+            
+            # If demoting from owner to member, ensure there's at least one owner left
+            if (member.role == 'owner' and new_role == 'member' and 
+                not OrganizationMember.objects.filter(
+                    organization=organization, role='owner'
+                ).exclude(pk=member.pk).exists()):
+                return Response({'error': 'Cannot demote the only owner'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Update role
+            old_role = member.role
+            member.role = new_role
+            member.modified_by = request.user
+            member.save()
+            
+            # Update Guardian permissions
+            if new_role == 'owner':
+                permissions = ['view_organization', 'change_organization', 'delete_organization', 'manage_organization']
+                bulk_assign_perms(permissions, member.user, organization)
+            else:
+                # Remove management permissions but keep view
+                permissions_to_remove = ['change_organization', 'delete_organization', 'manage_organization']
+                bulk_remove_perms(permissions_to_remove, member.user, organization)
         
         return Response({
             'message': f'Role changed from {old_role} to {new_role}',
@@ -437,11 +607,18 @@ class OrganizationSiteViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         """Filter sites based on organization access"""
         user = self.request.user
         if user.is_superuser:
-            return self.queryset
-        
-        # Get organizations user has access to
-        organizations = get_objects_for_user(user, 'view_organization', klass=Organization)
-        return OrganizationSite.objects.filter(organization__in=organizations)
+            queryset = self.queryset.all()
+        else:
+            # Get organizations user has access to
+            organizations = self.get_accessible_organizations('view_organization')
+            queryset = OrganizationSite.objects.filter(organization__in=organizations)
+        
+        # organization and site are joined for every action; the user count
+        # is only needed when the serializer renders it
+        queryset = self.get_serializer_class().setup_eager_loading(queryset)
+        if self.action == 'permissions':
+            return queryset
+        return with_site_user_counts(queryset)
     
     @action(detail=True, methods=['get'])
     def permissions(self, request, pk=None):
@@ -453,22 +630,27 @@ class OrganizationSiteViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
         if not request.user.has_perm('view_organization', organization):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        members = OrganizationMember.objects.filter(organization=organization, is_active=True)
-        permissions_data = []
-        
-        for member in members:
-            user_perms = get_perms(member.user, org_site.site)
-            permissions_data.append({
-                'user_id': member.user.id,
+        members = list(
+            OrganizationMember.objects.select_related(None).select_related('user').filter(
+                organization=organization, is_active=True
+            )
+        )
+        # Every member's permissions on the site in one round trip instead of one per member
+        perms_by_user = get_users_object_perms([member.user for member in members], org_site.site)
+        permissions_data = [
+            {
+                'user_id': member.user_id,
                 'username': member.user.username,
                 'role': member.role,
-                'permissions': list(user_perms)
-            })
+                'permissions': perms_by_user[member.user_id]
+            }
+            for member in members
+        ]
         
         return Response(permissions_data)
 
 
-class OrganizationInvitationViewSet(GuardianPermissionMixin, viewsets.ModelViewSet):
+class OrganizationInvitationViewSet(StreamingListMixin, GuardianPermissionMixin, viewsets.ModelViewSet):
     """
     ViewSet for Organization Invitation management
     """
@@ -480,11 +662,13 @@ class OrganizationInvitationViewSet(GuardianPermissionMixin, viewsets.ModelViewS
         """Filter invitations based on organization access"""
         user = self.request.user
         if user.is_superuser:
-            return self.queryset
+            queryset = self.queryset.all()
+        else:
+            # Get organizations user has access to
+            organizations = self.get_accessible_organizations('manage_organization')
+            queryset = OrganizationInvitation.objects.filter(organization__in=organizations)
         
-        # Get organizations user has access to
-        organizations = get_objects_for_user(user, 'manage_organization', klass=Organization)
-        return OrganizationInvitation.objects.filter(organization__in=organizations)
+        return self.get_serializer_class().setup_eager_loading(queryset)
     
     def perform_create(self, serializer):
         """Create invitation with proper permissions check"""
@@ -494,14 +678,19 @@ class OrganizationInvitationViewSet(GuardianPermissionMixin, viewsets.ModelViewS
         if not self.request.user.has_perm('manage_organization', organization):
             raise PermissionError('Permission denied')
         
-        # Check organization member limits
-        current_members = OrganizationMember.objects.filter(organization=organization, is_active=True).count()
-        pending_invitations = OrganizationInvitation.objects.filter(organization=organization, status='pending').count()
-        
-        if current_members + pending_invitations >= organization.max_members:
-            raise ValueError('Organization member limit reached')
-        
-        serializer.save(invited_by=self.request.user)
+        with transaction.atomic():
+            lock_organization(organization)
+            
+            # Check organization member limits
+            current_members = OrganizationMember.objects.filter(organization=organization, is_active=True).count()
+            pending_invitations = OrganizationInvitation.objects.filter(
+                organization=organization, is_accepted=False, expires_at__gt=timezone.now()
+            ).count()
+            
+            if current_members + pending_invitations >= organization.max_members:
+                raise ValueError('Organization member limit reached')
+            
+            serializer.save(invited_by=self.request.user)
     
     @action(detail=False, methods=['post'])
     def accept_invitation(self, request):
@@ -527,15 +716,15 @@ class OrganizationInvitationViewSet(GuardianPermissionMixin, viewsets.ModelViewS
         if not request.user.has_perm('manage_organization', invitation.organization):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        if invitation.status != 'pending':
+        if not invitation.is_valid():
             return Response({'error': 'Cannot resend non-pending invitation'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Generate new token and send email
+        # Generate new token and queue the email; a worker does the SMTP send
         invitation.generate_token()
-        invitation.save()
+        invitation.save(update_fields=['token', 'updated_at'])
         invitation.send_invitation_email()
         
-        return Response({'message': 'Invitation resent successfully'}, status=status.HTTP_200_OK)
+        return Response({'message': 'Invitation resend queued'}, status=status.HTTP_202_ACCEPTED)
 
 
 class SitePermissionViewSet(viewsets.ViewSet):
@@ -549,18 +738,27 @@ class SitePermissionViewSet(viewsets.ViewSet):
         user = request.user
         sites_with_perms = []
         
-        # Get all sites user has any permission on
+        # Get all sites user has any permission on, reading only the rendered columns
         sites = get_objects_for_user(user, ['view_client', 'change_client', 'delete_client'], 
-                                   klass=Site, any_perm=True)
-        
-        for site in sites:
-            user_perms = get_perms(user, site)
-            sites_with_perms.append({
-                'site_id': site.id,
-                'site_name': site.name,
-                'schema_name': site.schema_name,
-                'permissions': list(user_perms)
-            })
+                                   klass=Site, any_perm=True).only('id', 'name', 'schema_name')
+        
+        # Stream the sites in chunks and load each chunk's permissions in one go
+        # (user and group rows) instead of a get_perms query per site
+        rows = sites.iterator(chunk_size=SITE_PERMISSION_CHUNK_SIZE)
+        extend = sites_with_perms.extend
+        while batch := list(islice(rows, SITE_PERMISSION_CHUNK_SIZE)):
+            checker = ObjectPermissionChecker(user)
+            checker.prefetch_perms(batch)
+            get_perms = checker.get_perms
+            extend(
+                {
+                    'site_id': site.id,
+                    'site_name': site.name,
+                    'schema_name': site.schema_name,
+                    'permissions': get_perms(site)
+                }
+                for site in batch
+            )
         
         return Response(sites_with_perms)
     
@@ -0,0 +1,83 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Queue handler per logger name, so repeated calls don't stack queues
+_queue_handlers = {}
+
+
+class ProcessLocalQueueHandler(QueueHandler):
+    """
+    QueueHandler whose listener thread is started lazily, once per process.
+
+    Loggers are configured in the parent before gunicorn (--preload) and
+    Celery prefork fork their workers, and threads don't survive a fork.
+    Each process therefore starts its own listener on its first record,
+    with a fresh queue so records inherited from the parent aren't written
+    twice. The listener is stopped (and the queue flushed) at exit.
+    """
+
+    def __init__(self, handlers):
+        super().__init__(queue.SimpleQueue())
+        self.target_handlers = handlers
+        self._listener = None
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+        atexit.register(self.stop_listener)
+
+    def _reset_after_fork(self):
+        """Drop the parent's queue, listener and lock in a forked child"""
+        self.queue = queue.SimpleQueue()
+        self._listener = None
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+
+    def _start_listener(self):
+        with self._start_lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener = QueueListener(
+                self.queue, *self.target_handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().enqueue(record)
+
+    def stop_listener(self):
+        """Flush the queue and stop this process's listener, if it has one"""
+        if self._listener is not None and self._listener_pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._listener_pid = None
+
+
+def enable_queue_logging(*logger_names):
+    """
+    Move the handlers of the given loggers behind a QueueHandler.
+
+    The request thread only enqueues the LogRecord; formatting and file
+    I/O run on a background QueueListener thread, started in each process
+    on first use (see ProcessLocalQueueHandler).
+    """
+    for name in logger_names:
+        if name in _queue_handlers:
+            continue
+
+        logger = logging.getLogger(name)
+        handlers = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+        if not handlers:
+            continue
+
+        queue_handler = ProcessLocalQueueHandler(handlers)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        _queue_handlers[name] = queue_handler
@@ -1,29 +1,37 @@
-import uuid
+import re
 import logging
-import threading
+from itertools import count
+from contextvars import ContextVar
+from secrets import token_hex
+from time import monotonic
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from django.http import JsonResponse
 
-# Thread local storage for correlation ID
-_thread_locals = threading.local()
+# Context-local storage for correlation ID (carried into sync_to_async calls and across awaits)
+_correlation_id = ContextVar('correlation_id', default=None)
 
 def get_correlation_id():
     """Get the current request correlation ID"""
-    return getattr(_thread_locals, 'correlation_id', None)
+    return _correlation_id.get()
 
 def set_correlation_id(correlation_id):
     """Set the current request correlation ID"""
-    _thread_locals.correlation_id = correlation_id
+    return _correlation_id.set(correlation_id)
 
 class CorrelationIdMiddleware(MiddlewareMixin):
     """
     Middleware to add correlation ID to all requests for tracing
     """
+    # Served under WSGI only; declaring it lets the handler skip async adaptation
+    async_capable = False
+    
     def process_request(self, request):
         # Get correlation ID from header or generate new one
-        correlation_id = request.META.get('HTTP_X_CORRELATION_ID', str(uuid.uuid4()))
+        # (only generated when the header is missing or empty)
+        correlation_id = request.META.get('HTTP_X_CORRELATION_ID') or token_hex(16)
         
-        # Store in thread local
+        # Store in the request context
         set_correlation_id(correlation_id)
         
         # Add to request object
@@ -39,37 +47,45 @@ class CorrelationIdMiddleware(MiddlewareMixin):
         
         return response
 
+# Substrings that flag a request as suspicious when found in the user agent or path
+SUSPICIOUS_PATTERNS = (
+    'sqlmap', 'nikto', 'nmap', 'masscan', 'burp', 'scanner',
+    '<script', 'javascript:', 'eval(', 'alert(', 'onload=',
+    '../', '.env', 'wp-admin', 'phpmyadmin'
+)
+
+# All patterns in one case-insensitive alternation, so each string is scanned
+# once instead of once per pattern over lowercased copies
+_SUSPICIOUS_RE = re.compile('|'.join(map(re.escape, SUSPICIOUS_PATTERNS)), re.IGNORECASE)
+
 class SecurityLoggingMiddleware(MiddlewareMixin):
     """
     Middleware to log security-related events
     """
+    # Served under WSGI only; declaring it lets the handler skip async adaptation
+    async_capable = False
+    
     def __init__(self, get_response=None):
         super().__init__(get_response)
         self.security_logger = logging.getLogger('security')
+        self._log_warning = self.security_logger.warning
         
     def process_request(self, request):
         # Log potential security issues
         user_agent = request.META.get('HTTP_USER_AGENT', '')
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR', '')
         remote_addr = request.META.get('REMOTE_ADDR', '')
+        full_path = request.get_full_path()
         
-        # Check for suspicious patterns
-        suspicious_patterns = [
-            'sqlmap', 'nikto', 'nmap', 'masscan', 'burp', 'scanner',
-            '<script', 'javascript:', 'eval(', 'alert(', 'onload=',
-            '../', '.env', 'wp-admin', 'phpmyadmin'
-        ]
-        
-        is_suspicious = any(pattern in user_agent.lower() or 
-                          pattern in request.get_full_path().lower() 
-                          for pattern in suspicious_patterns)
+        # Check for suspicious patterns, matching case-insensitively in place
+        is_suspicious = bool(_SUSPICIOUS_RE.search(user_agent) or _SUSPICIOUS_RE.search(full_path))
         
         if is_suspicious:
-            self.security_logger.warning(
+            self._log_warning(
                 "Suspicious request detected",
                 extra={
                     'correlation_id': getattr(request, 'correlation_id', None),
-                    'path': request.get_full_path(),
+                    'path': full_path,
                     'method': request.method,
                     'user_agent': user_agent,
                     'remote_addr': remote_addr,
@@ -84,68 +100,100 @@ class APILoggingMiddleware(MiddlewareMixin):
     """
     Middleware to log API requests and responses
     """
+    # Served under WSGI only; declaring it lets the handler skip async adaptation
+    async_capable = False
+    
+    # Record extras, copied and filled per request (copying a fixed-shape
+    # dict is cheaper than building it key by key; logging copies the
+    # extras onto the record, so the copy is never shared)
+    _REQUEST_EXTRA = {
+        'correlation_id': None, 'method': None, 'path': None, 'user': None,
+        'user_agent': None, 'remote_addr': None, 'event_type': 'api_request'
+    }
+    _RESPONSE_EXTRA = {
+        'correlation_id': None, 'method': None, 'path': None, 'status_code': None,
+        'duration_ms': None, 'user': None, 'event_type': 'api_response'
+    }
+    
     def __init__(self, get_response=None):
         super().__init__(get_response)
         self.api_logger = logging.getLogger('api')
+        self._log_info = self.api_logger.info
+        # Log 1 in sample_rate requests; error responses are always logged
+        self.sample_rate = max(getattr(settings, 'API_LOG_SAMPLE_RATE', 1), 1)
+        self._request_counter = count()
         
     def process_request(self, request):
-        # Only log API requests (paths starting with /api/)
-        if request.path.startswith('/api/'):
-            import time
-            request._start_time = time.time()
-            
-            self.api_logger.info(
-                f"API Request: {request.method} {request.get_full_path()}",
-                extra={
-                    'correlation_id': getattr(request, 'correlation_id', None),
-                    'method': request.method,
-                    'path': request.get_full_path(),
-                    'user': str(request.user) if hasattr(request, 'user') else 'Anonymous',
-                    'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                    'remote_addr': request.META.get('REMOTE_ADDR', ''),
-                    'event_type': 'api_request'
-                }
-            )
+        # Only log API requests (paths starting with /api/), and skip building
+        # the records when INFO is filtered out
+        if not request.path.startswith('/api/') or not self.api_logger.isEnabledFor(logging.INFO):
+            return None
+        
+        request._start_time = monotonic()
+        request._api_log_sampled = sampled = next(self._request_counter) % self.sample_rate == 0
+        if not sampled:
+            return None
+        
+        # Kept for the response record, so the path is only built once per request
+        request._api_full_path = full_path = request.get_full_path()
+        method = request.method
+        
+        extra = self._REQUEST_EXTRA.copy()
+        extra['correlation_id'] = getattr(request, 'correlation_id', None)
+        extra['method'] = method
+        extra['path'] = full_path
+        extra['user'] = str(getattr(request, 'user', 'Anonymous'))
+        extra['user_agent'] = request.META.get('HTTP_USER_AGENT', '')
+        extra['remote_addr'] = request.META.get('REMOTE_ADDR', '')
+        
+        self._log_info(f"API Request: {method} {full_path}", extra=extra)
         
         return None
     
     def process_response(self, request, response):
-        # Only log API responses
-        if request.path.startswith('/api/') and hasattr(request, '_start_time'):
-            import time
-            duration = time.time() - request._start_time
-            
-            self.api_logger.info(
-                f"API Response: {request.method} {request.get_full_path()} - {response.status_code}",
-                extra={
-                    'correlation_id': getattr(request, 'correlation_id', None),
-                    'method': request.method,
-                    'path': request.get_full_path(),
-                    'status_code': response.status_code,
-                    'duration_ms': round(duration * 1000, 2),
-                    'user': str(request.user) if hasattr(request, 'user') else 'Anonymous',
-                    'event_type': 'api_response'
-                }
-            )
+        # Only API requests get a start time, so it doubles as the path check
+        start_time = getattr(request, '_start_time', None)
+        if start_time is None:
+            return response
+        
+        status_code = response.status_code
+        if not request._api_log_sampled and status_code < 400:
+            return response
+        
+        duration = monotonic() - start_time
+        full_path = getattr(request, '_api_full_path', None) or request.get_full_path()
+        method = request.method
+        
+        extra = self._RESPONSE_EXTRA.copy()
+        extra['correlation_id'] = getattr(request, 'correlation_id', None)
+        extra['method'] = method
+        extra['path'] = full_path
+        extra['status_code'] = status_code
+        extra['duration_ms'] = round(duration * 1000, 2)
+        extra['user'] = str(getattr(request, 'user', 'Anonymous'))
+        
+        self._log_info(f"API Response: {method} {full_path} - {status_code}", extra=extra)
         
         return response
 
-class CustomLoggerAdapter(logging.LoggerAdapter):
+class CorrelationIdFilter(logging.Filter):
     """
-    Logger adapter that automatically adds correlation ID to log records
+    Logging filter that stamps the current correlation ID onto records that
+    pass level filtering (an explicit extra correlation_id is kept)
     """
-    def process(self, msg, kwargs):
-        correlation_id = get_correlation_id()
-        if correlation_id:
-            # Add correlation ID to log record
-            if 'extra' not in kwargs:
-                kwargs['extra'] = {}
-            kwargs['extra']['correlation_id'] = correlation_id
-        
-        return msg, kwargs
+    def filter(self, record):
+        if getattr(record, 'correlation_id', None) is None:
+            correlation_id = _correlation_id.get()
+            if correlation_id:
+                record.correlation_id = correlation_id
+        return True
+
+_correlation_id_filter = CorrelationIdFilter()
 
 # Helper function to get a logger with correlation ID support
 def get_logger(name):
     """Get a logger that automatically includes correlation ID"""
     logger = logging.getLogger(name)
-    return CustomLoggerAdapter(logger, {})
\ No newline at end of file
+    # addFilter ignores a filter that is already attached
+    logger.addFilter(_correlation_id_filter)
+    return logger
@@ -195,7 +195,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.renderers.OrjsonRenderer',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': [
@@ -343,6 +343,8 @@ LOG_LEVEL = env('LOG_LEVEL', default='INFO')
 LOG_FORMAT = env('LOG_FORMAT', default='json')  # 'json' or 'standard'
 LOG_MAX_SIZE = env('LOG_MAX_SIZE', default='10MB')
 LOG_BACKUP_COUNT = env.int('LOG_BACKUP_COUNT', default=5)
+LOG_QUEUE_ENABLED = env.bool('LOG_QUEUE_ENABLED', default=True)  # Write request-path logs from a background thread
+API_LOG_SAMPLE_RATE = env.int('API_LOG_SAMPLE_RATE', default=1)  # Log 1 in N API requests; errors are always logged
 
 def parse_log_size(size_str):
     """Parse log size string like '10MB' to bytes"""
@@ -522,6 +524,13 @@ CELERY_ENABLE_UTC = True
 
 # Celery Beat settings (for periodic tasks)
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    # Write buffered member activity timestamps in one bulk UPDATE
+    'flush-member-last-active': {
+        'task': 'core.tasks.flush_member_last_active',
+        'schedule': env.int('LAST_ACTIVE_FLUSH_INTERVAL', default=30),
+    },
+}
 
 # Celery task routing (optional - for multiple queues)
 CELERY_TASK_ROUTES = {
@@ -653,6 +662,7 @@ PUBLIC_SCHEMA_NAME = env('PUBLIC_SCHEMA_NAME', default='public')
 # Default tenant settings
 # TENANT_CREATION_FAKES_MIGRATIONS = False
 # TENANT_BASE_SCHEMA = 'public'  # Required when TENANT_CREATION_FAKES_MIGRATIONS is True
+# Only issue SET search_path when the active schema actually changes
 TENANT_LIMIT_SET_CALLS = True
 
 # OpenTelemetry Configuration
@@ -1,6 +1,14 @@
 import os
+from functools import wraps
 from django.conf import settings
 
+try:
+    from opentelemetry import trace as otel_trace
+    from opentelemetry.trace import StatusCode
+except ImportError:
+    otel_trace = None
+    StatusCode = None
+
 def configure_opentelemetry():
     """Configure OpenTelemetry with automatic instrumentation"""
     
@@ -11,20 +19,10 @@ def configure_opentelemetry():
     # Let OpenTelemetry auto-instrument everything
     from opentelemetry.instrumentation.auto_instrumentation import sitecustomize
 
-def get_tracer(name: str = None):
-    """Get a tracer instance"""
-    try:
-        from opentelemetry import trace
-        return trace.get_tracer(name or __name__)
-    except ImportError:
-        # Return a no-op tracer if OpenTelemetry is not available
-        class NoOpTracer:
-            def start_as_current_span(self, name):
-                return NoOpSpan()
-        return NoOpTracer()
-
 class NoOpSpan:
     """No-op span for when tracing is disabled"""
+    __slots__ = ()
+    
     def __enter__(self):
         return self
     
@@ -37,19 +35,47 @@ class NoOpSpan:
     def set_attributes(self, attributes):
         pass
     
+    def set_status(self, status, description=None):
+        pass
+    
     def record_exception(self, exception):
         pass
 
+_NOOP_SPAN = NoOpSpan()
+
+class NoOpTracer:
+    """No-op tracer for when OpenTelemetry is not installed"""
+    __slots__ = ()
+    
+    def start_as_current_span(self, name):
+        # Stateless, so every span can be the same instance
+        return _NOOP_SPAN
+
+_NOOP_TRACER = NoOpTracer()
+
+def get_tracer(name: str = None):
+    """Get a tracer instance"""
+    if otel_trace is None:
+        # Return a no-op tracer if OpenTelemetry is not available
+        return _NOOP_TRACER
+    return otel_trace.get_tracer(name or __name__)
+
 def trace_function(name: str = None, attributes: dict = None):
-    """Decorator to trace function execution"""
+    """
+    Decorator to trace function execution.
+    
+    OTEL_ENABLED is read when the function is decorated; with tracing
+    disabled the function is returned unwrapped.
+    """
     def decorator(func):
+        if not getattr(settings, 'OTEL_ENABLED', True):
+            return func
+        
+        tracer = get_tracer(__name__)
+        span_name = name or f"{func.__module__}.{func.__name__}"
+        
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            if not getattr(settings, 'OTEL_ENABLED', True):
-                return func(*args, **kwargs)
-            
-            tracer = get_tracer(__name__)
-            span_name = name or f"{func.__module__}.{func.__name__}"
-            
             with tracer.start_as_current_span(span_name) as span:
                 if attributes:
                     span.set_attributes(attributes)
@@ -64,9 +90,9 @@ def trace_function(name: str = None, attributes: dict = None):
                     return result
                 except Exception as e:
                     span.record_exception(e)
-                    from opentelemetry.trace import StatusCode
-                    span.set_status(StatusCode.ERROR, str(e))
+                    if StatusCode is not None:
+                        span.set_status(StatusCode.ERROR, str(e))
                     raise
         
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
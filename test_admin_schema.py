@@ -16,16 +16,19 @@ django.setup()
 from core.admin import ClientAdmin, ClientAdminForm
 from core.models import Client
 
+# Shared across tests; neither holds per-request state
+_FACTORY = RequestFactory()
+_USER = User(username='testuser', is_superuser=True)
+
 def test_admin_form():
     """Test the custom admin form"""
     print("🔍 Testing ClientAdminForm...")
     
     # Create a mock request
-    factory = RequestFactory()
-    request = factory.post('/admin/')
+    request = _FACTORY.post('/admin/')
     
     # Add a user and messages to the request (required for admin)
-    request.user = User(username='testuser', is_superuser=True)
+    request.user = _USER
     setattr(request, 'session', {})
     messages = FallbackStorage(request)
     setattr(request, '_messages', messages)